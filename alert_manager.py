@@ -1,5 +1,22 @@
+import os
 import time
+import itertools
+import heapq
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from enum import IntEnum
+import numpy as np
+
+class AlertType(IntEnum):
+    """Integer codes for the supported alert types, used internally in place of strings."""
+    PRICE_ABOVE = 0
+    PRICE_BELOW = 1
+    PERCENT_CHANGE_ABOVE = 2
+    PERCENT_CHANGE_BELOW = 3
+    VOLUME_ABOVE = 4
+    BREAKOUT = 5
+
 
 class AlertCondition:
     """Class representing a stock alert condition."""
@@ -12,7 +29,13 @@ class AlertCondition:
     VOLUME_ABOVE = "volume_above"
     BREAKOUT = "breakout"
     
-    def __init__(self, symbol, alert_type, threshold, name=None, expiry=None):
+    # By default, don't retrigger within 1 hour
+    RETRIGGER_INTERVAL = 3600
+    
+    # Sequence number appended to alert IDs so alerts created in the same second stay distinct
+    _id_counter = itertools.count()
+    
+    def __init__(self, symbol, alert_type, threshold, name=None, expiry=None, now=None):
         """
         Initialize an alert condition.
         
@@ -22,76 +45,66 @@ class AlertCondition:
             threshold (float): Threshold value to trigger the alert
             name (str): Optional name for the alert
             expiry (int): Optional timestamp when this alert expires
+            now (int): Creation timestamp, read from the clock if not given
         """
+        if now is None:
+            now = int(time.time())
+        
         self.symbol = symbol
         self.alert_type = alert_type
+        self.alert_type_code = _STR_TO_CODE.get(alert_type, _UNKNOWN_CODE)
         self.threshold = threshold
         self.name = name or f"{symbol} {alert_type} {threshold}"
         self.expiry = expiry
-        self.created_at = int(time.time())
+        self.created_at = now
         self.triggered = False
         self.last_triggered = None
-        self.id = f"{symbol}_{alert_type}_{int(time.time())}"
+        self._retrigger_after = 0  # Earliest time (exclusive) this alert may trigger again
+        self.id = f"{symbol}_{alert_type}_{next(self._id_counter)}"
+        self._evaluator = _EVALUATORS.get(self.alert_type_code, _never_triggers)
     
-    def check(self, stock_data):
+    def check(self, stock_data, now=None):
         """
         Check if the alert condition is met.
         
         Args:
             stock_data (dict): Stock data to check against
+            now (int): Current timestamp, read from the clock if not given
             
         Returns:
             bool: True if condition is met, False otherwise
         """
-        if self.triggered and not self._can_retrigger():
+        if now is None:
+            now = int(time.time())
+        
+        if now <= self._retrigger_after:
             return False
             
-        if self.is_expired():
+        if self.expiry is not None and now > self.expiry:
             return False
             
-        current_price = stock_data.get('price') or stock_data.get('current_price')
-        previous_price = stock_data.get('previous_price')
-        percent_change = stock_data.get('pct_change')
-        volume = stock_data.get('volume')
-        
-        triggered = False
-        
-        if self.alert_type == self.PRICE_ABOVE and current_price is not None:
-            triggered = current_price > self.threshold
-            
-        elif self.alert_type == self.PRICE_BELOW and current_price is not None:
-            triggered = current_price < self.threshold
-            
-        elif self.alert_type == self.PERCENT_CHANGE_ABOVE and percent_change is not None:
-            triggered = percent_change > self.threshold
-            
-        elif self.alert_type == self.PERCENT_CHANGE_BELOW and percent_change is not None:
-            triggered = percent_change < self.threshold
-            
-        elif self.alert_type == self.VOLUME_ABOVE and volume is not None:
-            triggered = volume > self.threshold
-            
-        elif self.alert_type == self.BREAKOUT:
-            breakout_pct = stock_data.get('breakout_pct')
-            if breakout_pct is not None:
-                triggered = abs(breakout_pct) > self.threshold
+        triggered = self._evaluator(stock_data, self.threshold)
         
         if triggered:
-            self.triggered = True
-            self.last_triggered = int(time.time())
+            self._record_trigger(now)
             
         return triggered
     
-    def is_expired(self):
+    def _record_trigger(self, now):
+        """Mark the alert as triggered at the given time."""
+        self.triggered = True
+        self.last_triggered = now
+        self._retrigger_after = now + self.RETRIGGER_INTERVAL
+    
+    def is_expired(self, now=None):
         """Check if the alert has expired."""
-        if self.expiry is None:
-            return False
-        return int(time.time()) > self.expiry
+        if now is None:
+            now = int(time.time())
+        return self.expiry is not None and now > self.expiry
     
-    def _can_retrigger(self):
+    def _can_retrigger(self, now):
         """Check if the alert can be triggered again."""
-        # By default, don't retrigger within 1 hour
-        return self.last_triggered is None or (int(time.time()) - self.last_triggered) > 3600
+        return now > self._retrigger_after
     
     def to_dict(self):
         """Convert alert to dictionary."""
@@ -108,16 +121,111 @@ class AlertCondition:
         }
 
 
+def _current_price(stock_data):
+    """Get the current price from stock data, which may use either key."""
+    return stock_data.get('price') or stock_data.get('current_price')
+
+
+def _price_above(stock_data, threshold):
+    price = _current_price(stock_data)
+    return price is not None and price > threshold
+
+
+def _price_below(stock_data, threshold):
+    price = _current_price(stock_data)
+    return price is not None and price < threshold
+
+
+def _percent_change_above(stock_data, threshold):
+    percent_change = stock_data.get('pct_change')
+    return percent_change is not None and percent_change > threshold
+
+
+def _percent_change_below(stock_data, threshold):
+    percent_change = stock_data.get('pct_change')
+    return percent_change is not None and percent_change < threshold
+
+
+def _volume_above(stock_data, threshold):
+    volume = stock_data.get('volume')
+    return volume is not None and volume > threshold
+
+
+def _breakout(stock_data, threshold):
+    breakout_pct = stock_data.get('breakout_pct')
+    return breakout_pct is not None and abs(breakout_pct) > threshold
+
+
+def _never_triggers(stock_data, threshold):
+    return False
+
+
+# Condition evaluators, resolved once per alert instead of on every check
+_EVALUATORS = {
+    AlertType.PRICE_ABOVE: _price_above,
+    AlertType.PRICE_BELOW: _price_below,
+    AlertType.PERCENT_CHANGE_ABOVE: _percent_change_above,
+    AlertType.PERCENT_CHANGE_BELOW: _percent_change_below,
+    AlertType.VOLUME_ABOVE: _volume_above,
+    AlertType.BREAKOUT: _breakout
+}
+
+# Maps the public alert type strings to their integer codes
+_STR_TO_CODE = {
+    AlertCondition.PRICE_ABOVE: AlertType.PRICE_ABOVE,
+    AlertCondition.PRICE_BELOW: AlertType.PRICE_BELOW,
+    AlertCondition.PERCENT_CHANGE_ABOVE: AlertType.PERCENT_CHANGE_ABOVE,
+    AlertCondition.PERCENT_CHANGE_BELOW: AlertType.PERCENT_CHANGE_BELOW,
+    AlertCondition.VOLUME_ABOVE: AlertType.VOLUME_ABOVE,
+    AlertCondition.BREAKOUT: AlertType.BREAKOUT
+}
+_UNKNOWN_CODE = -1
+
+# Per AlertType code: which metric row an alert compares against (0 price, 1 pct_change,
+# 2 volume) and in which direction (+1 above, -1 below, 0 not a numeric alert).
+# The trailing entry is picked up by _UNKNOWN_CODE through negative indexing.
+_CODE_METRIC_ROWS = np.array([0, 0, 1, 1, 2, 0, 0], dtype=np.int64)
+_CODE_DIRECTIONS = np.array([1.0, -1.0, 1.0, -1.0, 1.0, 0.0, 0.0])
+
+
 class AlertManager:
     """
     Manages stock price alerts and notifications.
     """
     
-    def __init__(self):
-        """Initialize the alert manager."""
+    # Minimum number of alerts before evaluation is split across worker threads
+    PARALLEL_MIN_ALERTS = 10000
+    
+    def __init__(self, max_workers=None):
+        """
+        Initialize the alert manager.
+        
+        Args:
+            max_workers (int): Worker threads for evaluating large alert sets
+                               (defaults to the number of CPUs)
+        """
         self.alerts = {}  # Map of alert IDs to AlertCondition objects
-        self.triggered_alerts = []  # List of recently triggered alerts
+        self.alerts_by_symbol = {}  # Map of stock symbols to the IDs of their alerts
+        self._expiry_heap = []  # Min-heap of (expiry, alert ID); may hold IDs of removed alerts
+        self._unchecked_symbols = set()  # Symbols with alerts added since they were last checked
         self.max_triggered_history = 100  # Maximum number of triggered alerts to keep
+        self.triggered_alerts = deque(maxlen=self.max_triggered_history)  # Recently triggered alerts
+        
+        # Struct-of-arrays view of self.alerts, rebuilt lazily when alerts change
+        self._dirty = True
+        self._alert_ids = []
+        self._symbol_codes = {}  # Maps stock symbol to its position in the metric arrays
+        self._type_codes = np.empty(0, dtype=np.int8)
+        self._metric_rows = np.empty(0, dtype=np.int64)
+        self._directions = np.empty(0, dtype=np.float64)
+        self._thresholds = np.empty(0, dtype=np.float64)
+        self._symbol_idx = np.empty(0, dtype=np.int64)
+        self._retrigger_after = np.empty(0, dtype=np.int64)
+        self._breakout_positions = np.empty(0, dtype=np.int64)
+        
+        # Thread pool for large alert sets, created on first use
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool = None
     
     def add_alert(self, symbol, alert_type, threshold, name=None, expiry=None):
         """
@@ -135,6 +243,11 @@ class AlertManager:
         """
         alert = AlertCondition(symbol, alert_type, threshold, name, expiry)
         self.alerts[alert.id] = alert
+        self.alerts_by_symbol.setdefault(symbol, set()).add(alert.id)
+        self._unchecked_symbols.add(symbol)
+        if expiry is not None:
+            heapq.heappush(self._expiry_heap, (expiry, alert.id))
+        self._dirty = True
         return alert.id
     
     def remove_alert(self, alert_id):
@@ -149,9 +262,35 @@ class AlertManager:
         """
         if alert_id in self.alerts:
             alert = self.alerts.pop(alert_id)
+            symbol_alerts = self.alerts_by_symbol[alert.symbol]
+            symbol_alerts.discard(alert_id)
+            if not symbol_alerts:
+                del self.alerts_by_symbol[alert.symbol]
+            self._dirty = True
             return True
         return False
     
+    def _rebuild_arrays(self):
+        """Rebuild the struct-of-arrays view of the active alerts."""
+        alerts = list(self.alerts.values())
+        n = len(alerts)
+        
+        self._alert_ids = [alert.id for alert in alerts]
+        self._symbol_codes = {}
+        for alert in alerts:
+            self._symbol_codes.setdefault(alert.symbol, len(self._symbol_codes))
+        
+        self._type_codes = np.fromiter(
+            (alert.alert_type_code for alert in alerts), dtype=np.int8, count=n)
+        self._thresholds = np.fromiter((alert.threshold for alert in alerts), dtype=np.float64, count=n)
+        self._symbol_idx = np.fromiter(
+            (self._symbol_codes[alert.symbol] for alert in alerts), dtype=np.int64, count=n)
+        self._retrigger_after = np.fromiter((alert._retrigger_after for alert in alerts), dtype=np.int64, count=n)
+        self._metric_rows = _CODE_METRIC_ROWS[self._type_codes]
+        self._directions = _CODE_DIRECTIONS[self._type_codes]
+        self._breakout_positions = np.flatnonzero(self._type_codes == AlertType.BREAKOUT)
+        self._dirty = False
+    
     def check_alerts(self, stocks_data):
         """
         Check all alerts against current stock data.
@@ -163,33 +302,131 @@ class AlertManager:
             list: List of triggered alerts
         """
         triggered = []
-        current_time = int(time.time())
+        now = int(time.time())
+        self._unchecked_symbols.difference_update(stocks_data)
         
-        # Remove expired alerts
-        expired_ids = [aid for aid, alert in self.alerts.items() if alert.is_expired()]
-        for aid in expired_ids:
-            del self.alerts[aid]
+        # Remove expired alerts, skipping entries for alerts that were already removed
+        expiry_heap = self._expiry_heap
+        while expiry_heap and expiry_heap[0][0] < now:
+            _, alert_id = heapq.heappop(expiry_heap)
+            alert = self.alerts.get(alert_id)
+            if alert is not None and alert.is_expired(now):
+                self.remove_alert(alert_id)
         
-        # Check each alert
-        for alert_id, alert in list(self.alerts.items()):
+        if self._dirty:
+            self._rebuild_arrays()
+        
+        if not self.alerts:
+            return triggered
+        
+        # Gather the metrics alerts compare against: one row per metric, one column per tracked symbol.
+        # Only symbols in this tick that have alerts need to be looked at.
+        metrics = np.full((3, len(self._symbol_codes)), np.nan)
+        prices, pct_changes, volumes = metrics
+        has_data = False
+        for symbol, stock_data in stocks_data.items():
+            code = self._symbol_codes.get(symbol)
+            if code is None or not stock_data:
+                continue
+            has_data = True
+            price = _current_price(stock_data)
+            pct_change = stock_data.get('pct_change')
+            volume = stock_data.get('volume')
+            if price is not None:
+                prices[code] = price
+            if pct_change is not None:
+                pct_changes[code] = pct_change
+            if volume is not None:
+                volumes[code] = volume
+        
+        if not has_data:
+            return triggered
+        
+        # Evaluate numeric alerts, splitting large alert sets into slices across worker threads
+        n_alerts = len(self._alert_ids)
+        if self.max_workers > 1 and n_alerts >= self.PARALLEL_MIN_ALERTS:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            bounds = np.linspace(0, n_alerts, self.max_workers + 1).astype(np.int64)
+            futures = [
+                self._pool.submit(self._evaluate_numeric, start, stop, metrics, now)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            fired = np.concatenate([future.result() for future in futures])
+        else:
+            fired = self._evaluate_numeric(0, n_alerts, metrics, now)
+        
+        # Breakout alerts depend on per-stock breakout data, so check them individually
+        for pos in self._breakout_positions:
+            alert = self.alerts[self._alert_ids[pos]]
             stock_data = stocks_data.get(alert.symbol)
-            if stock_data:
-                if alert.check(stock_data):
-                    triggered_info = {
-                        'alert': alert.to_dict(),
-                        'timestamp': current_time,
-                        'datetime': datetime.fromtimestamp(current_time).strftime('%Y-%m-%d %H:%M:%S'),
-                        'stock_data': stock_data
-                    }
-                    triggered.append(triggered_info)
-                    self.triggered_alerts.append(triggered_info)
-        
-        # Trim triggered alerts history
-        if len(self.triggered_alerts) > self.max_triggered_history:
-            self.triggered_alerts = self.triggered_alerts[-self.max_triggered_history:]
+            if stock_data and alert.check(stock_data, now):
+                fired[pos] = True
+        
+        fired_positions = np.flatnonzero(fired)
+        if not fired_positions.size:
+            return triggered
+        
+        datetime_str = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+        for pos in fired_positions:
+            alert = self.alerts[self._alert_ids[pos]]
+            alert._record_trigger(now)
+            self._retrigger_after[pos] = alert._retrigger_after
+            
+            triggered_info = {
+                'alert': alert.to_dict(),
+                'timestamp': now,
+                'datetime': datetime_str,
+                'stock_data': stocks_data[alert.symbol]
+            }
+            triggered.append(triggered_info)
+            self.triggered_alerts.append(triggered_info)
         
         return triggered
     
+    def check_alerts_for_symbols(self, symbols, stocks_data):
+        """
+        Check alerts only for the given symbols, typically those whose data changed.
+        
+        Symbols that gained alerts since they were last checked are always included,
+        so a new alert is evaluated on the next tick even if its stock did not move.
+        
+        Args:
+            symbols (iterable): Stock symbols to check
+            stocks_data (dict): Map of stock symbols to their current data
+            
+        Returns:
+            list: List of triggered alerts
+        """
+        symbols = self._unchecked_symbols.union(symbols)
+        changed_data = {symbol: stocks_data[symbol] for symbol in symbols
+                        if symbol in self.alerts_by_symbol and symbol in stocks_data}
+        if not changed_data:
+            return []
+        return self.check_alerts(changed_data)
+    
+    def _evaluate_numeric(self, start, stop, metrics, now):
+        """
+        Evaluate the numeric alerts in positions [start, stop) of the alert arrays.
+        
+        Args:
+            start (int): First alert position to evaluate
+            stop (int): Position after the last alert to evaluate
+            metrics (np.ndarray): Price, pct_change and volume rows per tracked symbol (NaN if unknown)
+            now (int): Current timestamp
+            
+        Returns:
+            np.ndarray: Boolean mask of the alerts in the slice that fired
+        """
+        # One gather and one signed comparison cover every numeric alert type:
+        # value > threshold for "above" alerts, value < threshold for "below" alerts
+        values = metrics[self._metric_rows[start:stop], self._symbol_idx[start:stop]]
+        fired = self._directions[start:stop] * (values - self._thresholds[start:stop]) > 0
+        
+        # Alerts that already fired may only trigger again once the retrigger interval has passed
+        fired &= now > self._retrigger_after[start:stop]
+        return fired
+    
     def get_alerts_for_symbol(self, symbol):
         """
         Get all alerts for a specific symbol.
@@ -200,7 +437,7 @@ class AlertManager:
         Returns:
             list: List of alerts for the given symbol
         """
-        return [alert for alert in self.alerts.values() if alert.symbol == symbol]
+        return [self.alerts[alert_id] for alert_id in self.alerts_by_symbol.get(symbol, ())]
     
     def get_alert(self, alert_id):
         """
@@ -233,4 +470,10 @@ class AlertManager:
         Returns:
             list: List of recently triggered alerts
         """
-        return self.triggered_alerts[-limit:] if self.triggered_alerts else []
+        return list(self.triggered_alerts)[-limit:]
+    
+    def close(self):
+        """Shut down the alert evaluation thread pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -1,9 +1,22 @@
 import plotly.graph_objects as go
-import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
 
+# Buttons for toggling the range slider on price charts
+_RANGE_SLIDER_BUTTONS = (
+    dict(
+        args=[{"xaxis.rangeslider.visible": True}],
+        label="Show Range Slider",
+        method="relayout"
+    ),
+    dict(
+        args=[{"xaxis.rangeslider.visible": False}],
+        label="Hide Range Slider",
+        method="relayout"
+    )
+)
+
 class StockVisualizer:
     """
     Class for creating interactive stock visualizations.
@@ -17,6 +30,66 @@ class StockVisualizer:
             theme (str): Plotly theme to use for charts
         """
         self.theme = theme
+        
+        # Layouts are built and validated once here, then reused by every chart
+        self._price_layout_template = go.Layout(
+            xaxis_title="Date",
+            yaxis_title="Price",
+            template=theme,
+            xaxis_rangeslider_visible=True,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            height=600,
+            # Add buttons for time range selection
+            updatemenus=[
+                dict(
+                    type="buttons",
+                    direction="right",
+                    buttons=list(_RANGE_SLIDER_BUTTONS),
+                    pad={"r": 10, "t": 10},
+                    showactive=True,
+                    x=0.1,
+                    xanchor="left",
+                    y=1.1,
+                    yanchor="top"
+                )
+            ]
+        )
+        self._volume_axis_template = go.layout.YAxis(
+            title="Volume",
+            overlaying="y",
+            side="right",
+            showgrid=False
+        )
+        self._comparison_layout_template = go.Layout(
+            xaxis_title="Date",
+            template=theme,
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            height=500
+        )
+        self._heatmap_layout_template = go.Layout(
+            xaxis_title="Stock",
+            yaxis=dict(title="Stock", autorange="reversed"),
+            template=theme,
+            height=600,
+            width=700
+        )
+        gainers_losers_layout = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=("Top Gainers", "Top Losers"),
+            specs=[[{"type": "bar"}, {"type": "bar"}]]
+        ).layout
+        gainers_losers_layout.update(
+            yaxis_title="% Change",
+            template=theme,
+            showlegend=False,
+            height=400
+        )
+        self._gainers_losers_layout_template = gainers_losers_layout
+        self._distribution_layout_template = go.Layout(
+            yaxis_title="Count",
+            template=theme,
+            height=400
+        )
     
     def create_price_chart(self, historical_data, title=None):
         """
@@ -33,16 +106,19 @@ class StockVisualizer:
             return None
         
         # Create figure
-        fig = go.Figure()
+        fig = go.Figure(layout=self._price_layout_template)
+        
+        # Hand Plotly contiguous NumPy arrays rather than pandas objects
+        dates = historical_data.index.to_numpy()
         
         # Add candlestick chart
         fig.add_trace(
             go.Candlestick(
-                x=historical_data.index,
-                open=historical_data['Open'],
-                high=historical_data['High'],
-                low=historical_data['Low'],
-                close=historical_data['Close'],
+                x=dates,
+                open=historical_data['Open'].to_numpy(),
+                high=historical_data['High'].to_numpy(),
+                low=historical_data['Low'].to_numpy(),
+                close=historical_data['Close'].to_numpy(),
                 name="Price"
             )
         )
@@ -51,8 +127,8 @@ class StockVisualizer:
         if 'Volume' in historical_data.columns:
             fig.add_trace(
                 go.Bar(
-                    x=historical_data.index,
-                    y=historical_data['Volume'],
+                    x=dates,
+                    y=historical_data['Volume'].to_numpy(),
                     name="Volume",
                     marker_color='rgba(0, 150, 255, 0.3)',
                     opacity=0.3,
@@ -61,53 +137,9 @@ class StockVisualizer:
             )
             
             # Add secondary y-axis for volume
-            fig.update_layout(
-                yaxis2=dict(
-                    title="Volume",
-                    overlaying="y",
-                    side="right",
-                    showgrid=False
-                )
-            )
-        
-        # Customize layout
-        fig.update_layout(
-            title=title or f"Price Chart for {historical_data['symbol'].iloc[0] if 'symbol' in historical_data.columns else 'Stock'}",
-            xaxis_title="Date",
-            yaxis_title="Price",
-            template=self.theme,
-            xaxis_rangeslider_visible=True,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            height=600
-        )
+            fig.layout.yaxis2 = self._volume_axis_template
         
-        # Add buttons for time range selection
-        fig.update_layout(
-            updatemenus=[
-                dict(
-                    type="buttons",
-                    direction="right",
-                    buttons=list([
-                        dict(
-                            args=[{"xaxis.rangeslider.visible": True}],
-                            label="Show Range Slider",
-                            method="relayout"
-                        ),
-                        dict(
-                            args=[{"xaxis.rangeslider.visible": False}],
-                            label="Hide Range Slider",
-                            method="relayout"
-                        )
-                    ]),
-                    pad={"r": 10, "t": 10},
-                    showactive=True,
-                    x=0.1,
-                    xanchor="left",
-                    y=1.1,
-                    yanchor="top"
-                )
-            ]
-        )
+        fig.layout.title = title or f"Price Chart for {historical_data['symbol'].iloc[0] if 'symbol' in historical_data.columns else 'Stock'}"
         
         return fig
     
@@ -126,39 +158,31 @@ class StockVisualizer:
         if not stocks_data:
             return None
         
-        fig = go.Figure()
+        fig = go.Figure(layout=self._comparison_layout_template)
         
-        # Normalize data to compare different price ranges
-        normalized_data = {}
+        # Normalize each stock's data to compare different price ranges and add it as a line
         for symbol, data in stocks_data.items():
             if data.empty or metric not in data.columns:
                 continue
                 
             # Normalize to first value = 100
-            base_value = data[metric].iloc[0]
-            if base_value != 0:
-                normalized_data[symbol] = data[metric] / base_value * 100
-        
-        # Add a line for each stock
-        for symbol, values in normalized_data.items():
+            values = data[metric].to_numpy()
+            base_value = values[0]
+            if base_value == 0:
+                continue
+            
             fig.add_trace(
                 go.Scatter(
-                    x=values.index,
-                    y=values,
+                    x=data.index.to_numpy(),
+                    y=values * (100.0 / base_value),
                     mode='lines',
                     name=symbol
                 )
             )
         
         # Customize layout
-        fig.update_layout(
-            title=title or f"Stock Comparison ({metric})",
-            xaxis_title="Date",
-            yaxis_title=f"Normalized {metric} (%)",
-            template=self.theme,
-            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
-            height=500
-        )
+        fig.layout.title = title or f"Stock Comparison ({metric})"
+        fig.layout.yaxis.title = f"Normalized {metric} (%)"
         
         return fig
     
@@ -176,20 +200,26 @@ class StockVisualizer:
         if correlation_matrix.empty:
             return None
         
-        fig = px.imshow(
-            correlation_matrix,
-            text_auto=True,
-            color_continuous_scale='RdBu_r',
-            labels=dict(x="Stock", y="Stock", color="Correlation")
+        # Cell labels are rounded in one vectorized pass instead of formatted per cell
+        values = correlation_matrix.to_numpy()
+        fig = go.Figure(
+            data=[go.Heatmap(
+                z=values,
+                x=correlation_matrix.columns.to_numpy(),
+                y=correlation_matrix.index.to_numpy(),
+                text=np.round(values, 2),
+                texttemplate="%{text}",
+                hovertemplate="Stock: %{x}<br>Stock: %{y}<br>Correlation: %{z}<extra></extra>",
+                colorscale='RdBu_r',
+                zmin=-1,
+                zmax=1,
+                colorbar=dict(title="Correlation")
+            )],
+            layout=self._heatmap_layout_template
         )
         
         # Customize layout
-        fig.update_layout(
-            title=title or "Stock Correlation Heatmap",
-            template=self.theme,
-            height=600,
-            width=700
-        )
+        fig.layout.title = title or "Stock Correlation Heatmap"
         
         return fig
     
@@ -212,12 +242,8 @@ class StockVisualizer:
         loser_symbols = [l[1] for l in losers]
         loser_values = [l[0] for l in losers]
         
-        # Create subplots
-        fig = make_subplots(
-            rows=1, cols=2,
-            subplot_titles=("Top Gainers", "Top Losers"),
-            specs=[[{"type": "bar"}, {"type": "bar"}]]
-        )
+        # Create side-by-side subplots from the prebuilt layout
+        fig = go.Figure(layout=self._gainers_losers_layout_template)
         
         # Add gainers
         fig.add_trace(
@@ -226,29 +252,22 @@ class StockVisualizer:
                 y=gainer_values,
                 marker_color='green',
                 name="Gainers"
-            ),
-            row=1, col=1
+            )
         )
         
-        # Add losers
+        # Add losers to the second subplot
         fig.add_trace(
             go.Bar(
                 x=loser_symbols,
                 y=loser_values,
                 marker_color='red',
-                name="Losers"
-            ),
-            row=1, col=2
+                name="Losers",
+                xaxis="x2",
+                yaxis="y2"
+            )
         )
         
-        # Customize layout
-        fig.update_layout(
-            title=title or "Top Gainers and Losers",
-            yaxis_title="% Change",
-            template=self.theme,
-            showlegend=False,
-            height=400
-        )
+        fig.layout.title = title or "Top Gainers and Losers"
         
         return fig
     
@@ -264,13 +283,13 @@ class StockVisualizer:
         Returns:
             go.Figure: Plotly figure object
         """
-        # Extract values
-        values = []
-        for symbol, data in stocks_data.items():
-            if isinstance(data, dict) and metric in data:
-                values.append(data[metric])
+        # Extract values straight into a float64 buffer
+        values = np.fromiter(
+            (data[metric] for data in stocks_data.values() if isinstance(data, dict) and metric in data),
+            dtype=np.float64
+        )
         
-        if not values:
+        if values.size == 0:
             return None
         
         # Create histogram
@@ -280,11 +299,12 @@ class StockVisualizer:
                 nbinsx=20,
                 marker_color='rgba(0, 128, 255, 0.7)',
                 opacity=0.8
-            )]
+            )],
+            layout=self._distribution_layout_template
         )
         
         # Add mean line
-        mean_value = np.mean(values)
+        mean_value = values.mean()
         fig.add_vline(
             x=mean_value, 
             line_dash="dash", 
@@ -294,12 +314,7 @@ class StockVisualizer:
         )
         
         # Customize layout
-        fig.update_layout(
-            title=title or f"Distribution of {metric}",
-            xaxis_title=metric,
-            yaxis_title="Count",
-            template=self.theme,
-            height=400
-        )
+        fig.layout.title = title or f"Distribution of {metric}"
+        fig.layout.xaxis.title = metric
         
         return fig
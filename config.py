@@ -30,6 +30,9 @@ LONG_WINDOW_SIZE = 120
 
 # Update intervals (in seconds)
 UPDATE_INTERVAL = 60  # 1 minute
+HISTORICAL_CACHE_EXPIRY = 60  # Seconds historical data is served from cache
+HISTORICAL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache')  # Directory where historical data is kept across restarts
+MAX_UPDATE_BACKOFF = 15 * 60  # Longest wait between updates after repeated failures
 
 # Alert Configuration
 MAX_ALERTS_HISTORY = 100
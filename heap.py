@@ -1,128 +1,176 @@
-import heapq
+class IndexedHeap:
+    """
+    A bounded, symbol-indexed heap for tracking the best or worst performing stocks.
 
-class StockMinHeap:
-    """A min-heap implementation for tracking worst-performing stocks."""
-    
-    def __init__(self, max_size=10):
-        self.heap = []
+    Entries are ordered by key = sign * value, so sign=1 ranks the smallest values
+    first (min-heap) and sign=-1 ranks the largest values first (max-heap).
+    """
+
+    def __init__(self, max_size=10, sign=1):
+        # Parallel lists hold the heap entries; the root has the largest key
+        # so a full heap can evict its weakest entry in O(log n)
+        self.sign = sign
+        self.keys = []
+        self.values = []  # Original values, kept so reads need no arithmetic
+        self.symbols = []
+        self.timestamps = []
         self.max_size = max_size
         self.stock_index = {}  # Maps stock symbol to position in heap
-    
+
     def push(self, stock_symbol, value, timestamp):
         """
-        Add a stock to the min-heap or update its value.
-        
+        Add a stock to the heap or update its value.
+
         Args:
             stock_symbol (str): The stock ticker symbol
             value (float): The value to track (e.g., percentage change)
             timestamp (int/float): When this value was recorded
         """
-        item = (value, stock_symbol, timestamp)
-        
-        if stock_symbol in self.stock_index:
-            # Update existing stock
-            old_idx = self.stock_index[stock_symbol]
-            self.heap[old_idx] = item
-            heapq.heapify(self.heap)
-        else:
-            # Add new stock
-            if len(self.heap) < self.max_size:
-                heapq.heappush(self.heap, item)
-            elif value < self.heap[0][0]:
-                # If heap is full, replace the smallest item if new value is smaller
-                heapq.heappushpop(self.heap, item)
-            else:
-                return
-                
-        # Update index mapping
-        self._update_index()
-    
-    def _update_index(self):
-        """Update the index mapping after heap changes."""
-        self.stock_index = {item[1]: idx for idx, item in enumerate(self.heap)}
-    
-    def get_top(self, n=None):
-        """Get the top n stocks with smallest values."""
-        if n is None:
-            n = self.max_size
-        
-        return sorted(self.heap)[:min(n, len(self.heap))]
-    
-    def remove(self, stock_symbol):
-        """Remove a stock from the heap."""
+        key = self.sign * value
+
         if stock_symbol in self.stock_index:
+            # Update existing stock in place and restore heap order
             idx = self.stock_index[stock_symbol]
-            self.heap[idx] = self.heap[-1]
-            self.heap.pop()
-            if self.heap:
-                heapq.heapify(self.heap)
-            del self.stock_index[stock_symbol]
-            self._update_index()
-            return True
-        return False
+            old_key = self.keys[idx]
+            self.keys[idx] = key
+            self.values[idx] = value
+            self.timestamps[idx] = timestamp
+            if key > old_key:
+                self._sift_up(idx)
+            else:
+                self._sift_down(idx)
+        elif len(self.keys) < self.max_size:
+            # Add new stock
+            self.keys.append(key)
+            self.values.append(value)
+            self.symbols.append(stock_symbol)
+            self.timestamps.append(timestamp)
+            self.stock_index[stock_symbol] = len(self.keys) - 1
+            self._sift_up(len(self.keys) - 1)
+        elif key < self.keys[0]:
+            # If heap is full, replace the weakest retained item if new value ranks higher
+            del self.stock_index[self.symbols[0]]
+            self.keys[0] = key
+            self.values[0] = value
+            self.symbols[0] = stock_symbol
+            self.timestamps[0] = timestamp
+            self.stock_index[stock_symbol] = 0
+            self._sift_down(0)
 
+    def clear(self):
+        """Remove every stock from the heap."""
+        self.keys.clear()
+        self.values.clear()
+        self.symbols.clear()
+        self.timestamps.clear()
+        self.stock_index.clear()
 
-class StockMaxHeap:
-    """A max-heap implementation for tracking best-performing stocks."""
-    
-    def __init__(self, max_size=10):
-        self.heap = []
-        self.max_size = max_size
-        self.stock_index = {}  # Maps stock symbol to position in heap
-    
-    def push(self, stock_symbol, value, timestamp):
+    def replace_all(self, stock_symbols, values, timestamps):
         """
-        Add a stock to the max-heap or update its value.
-        For max-heap, we negate the value when storing.
-        
+        Replace the heap contents with the given stocks in one step.
+
         Args:
-            stock_symbol (str): The stock ticker symbol
-            value (float): The value to track (e.g., percentage change)
-            timestamp (int/float): When this value was recorded
+            stock_symbols (list): Stock ticker symbols, each at most once
+            values (list): Value tracked for each stock
+            timestamps (list): When each value was recorded
         """
-        # Negate value for max-heap behavior
-        item = (-value, stock_symbol, timestamp)
-        
-        if stock_symbol in self.stock_index:
-            # Update existing stock
-            old_idx = self.stock_index[stock_symbol]
-            self.heap[old_idx] = item
-            heapq.heapify(self.heap)
-        else:
-            # Add new stock
-            if len(self.heap) < self.max_size:
-                heapq.heappush(self.heap, item)
-            elif -value > self.heap[0][0]:
-                # If heap is full, replace the smallest item if new value is larger (negated)
-                heapq.heappushpop(self.heap, item)
-            else:
-                return
-                
-        # Update index mapping
-        self._update_index()
-    
-    def _update_index(self):
-        """Update the index mapping after heap changes."""
-        self.stock_index = {item[1]: idx for idx, item in enumerate(self.heap)}
-    
+        sign = self.sign
+        keys = [sign * value for value in values]
+        if len(keys) > self.max_size:
+            # Keep only the entries a sequence of pushes could have retained
+            ranked = sorted(zip(keys, stock_symbols, values, timestamps))[:self.max_size]
+            keys = [key for key, _, _, _ in ranked]
+            stock_symbols = [symbol for _, symbol, _, _ in ranked]
+            values = [value for _, _, value, _ in ranked]
+            timestamps = [ts for _, _, _, ts in ranked]
+
+        self.keys = keys
+        self.values = list(values)
+        self.symbols = list(stock_symbols)
+        self.timestamps = list(timestamps)
+        self.stock_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        # Heapify bottom-up in O(n) rather than pushing entries one by one
+        for i in range(len(keys) // 2 - 1, -1, -1):
+            self._sift_down(i)
+
+    def _swap(self, i, j):
+        """Swap two heap entries and keep the index mapping in sync."""
+        keys, values, symbols, timestamps = self.keys, self.values, self.symbols, self.timestamps
+        keys[i], keys[j] = keys[j], keys[i]
+        values[i], values[j] = values[j], values[i]
+        symbols[i], symbols[j] = symbols[j], symbols[i]
+        timestamps[i], timestamps[j] = timestamps[j], timestamps[i]
+        self.stock_index[symbols[i]] = i
+        self.stock_index[symbols[j]] = j
+
+    def _sift_up(self, i):
+        """Move the entry at position i towards the root until heap order holds."""
+        keys = self.keys
+        while i > 0:
+            parent = (i - 1) >> 1
+            if keys[i] <= keys[parent]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i):
+        """Move the entry at position i towards the leaves until heap order holds."""
+        keys = self.keys
+        n = len(keys)
+        while True:
+            largest = i
+            left = 2 * i + 1
+            right = left + 1
+            if left < n and keys[left] > keys[largest]:
+                largest = left
+            if right < n and keys[right] > keys[largest]:
+                largest = right
+            if largest == i:
+                break
+            self._swap(i, largest)
+            i = largest
+
     def get_top(self, n=None):
-        """Get the top n stocks with largest values."""
+        """Get the top n stocks in rank order (smallest first for min, largest first for max)."""
         if n is None:
             n = self.max_size
-        
-        # Return sorted values, unnegating the values
-        result = [(abs(val), symbol, ts) for val, symbol, ts in sorted(self.heap)]
-        return result[:min(n, len(self.heap))]
-    
+
+        # Rank by key, then build result tuples only for the entries returned
+        ranked = sorted(zip(self.keys, self.symbols, self.values, self.timestamps))[:n]
+        return [(val, symbol, ts) for _, symbol, val, ts in ranked]
+
     def remove(self, stock_symbol):
         """Remove a stock from the heap."""
-        if stock_symbol in self.stock_index:
-            idx = self.stock_index[stock_symbol]
-            self.heap[idx] = self.heap[-1]
-            self.heap.pop()
-            if self.heap:
-                heapq.heapify(self.heap)
-            del self.stock_index[stock_symbol]
-            self._update_index()
-            return True
-        return False
+        idx = self.stock_index.pop(stock_symbol, None)
+        if idx is None:
+            return False
+
+        # Move the last entry into the freed slot, then sift it into place
+        last_key = self.keys.pop()
+        last_value = self.values.pop()
+        last_symbol = self.symbols.pop()
+        last_timestamp = self.timestamps.pop()
+        if idx < len(self.keys):
+            self.keys[idx] = last_key
+            self.values[idx] = last_value
+            self.symbols[idx] = last_symbol
+            self.timestamps[idx] = last_timestamp
+            self.stock_index[last_symbol] = idx
+            self._sift_up(idx)
+            self._sift_down(idx)
+        return True
+
+
+class StockMinHeap(IndexedHeap):
+    """A min-heap implementation for tracking worst-performing stocks."""
+
+    def __init__(self, max_size=10):
+        super().__init__(max_size=max_size, sign=1)
+
+
+class StockMaxHeap(IndexedHeap):
+    """A max-heap implementation for tracking best-performing stocks."""
+
+    def __init__(self, max_size=10):
+        super().__init__(max_size=max_size, sign=-1)
@@ -1,11 +1,14 @@
 import time
+import logging
 import threading
-import schedule
+import requests
 import dash
 from dash import dcc, html
 import dash_bootstrap_components as dbc
 from dash.dependencies import Input, Output, State
+from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -16,6 +19,16 @@ from alert_manager import AlertManager
 from charts import StockVisualizer
 import config
 
+logger = logging.getLogger(__name__)
+
+# Callback figures are serialized through Plotly's JSON encoder; orjson encodes
+# NumPy arrays and floats natively and is much faster than the stdlib encoder
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    logger.info("orjson is not installed; using the standard JSON encoder for figures")
+
 class StockAnalysisApp:
     """
     Main application class for real-time stock analysis.
@@ -24,7 +37,11 @@ class StockAnalysisApp:
     def __init__(self):
         """Initialize the stock analysis application."""
         # Initialize components
-        self.api = StockAPI(default_symbols=config.DEFAULT_SYMBOLS)
+        self.api = StockAPI(
+            default_symbols=config.DEFAULT_SYMBOLS,
+            cache_expiry=config.HISTORICAL_CACHE_EXPIRY,
+            cache_dir=config.HISTORICAL_CACHE_DIR
+        )
         self.trend_analyzer = TrendAnalyzer(
             max_size=config.MAX_HEAP_SIZE, 
             window_size=config.DEFAULT_WINDOW_SIZE,
@@ -41,9 +58,20 @@ class StockAnalysisApp:
         # Last update timestamp
         self.last_update = None
         
+        # Bumped whenever an update brings new data; the dashboard only
+        # re-renders when the version it holds falls behind
+        self.data_version = 0
+        
+        # Rendered figures and tables for the current data version, shared by
+        # every callback invocation and client until the data changes
+        self._render_cache = {}
+        self._render_cache_version = None
+        
         # Threading and scheduling
         self.update_thread = None
         self.is_running = False
+        self._stop_event = threading.Event()  # Wakes the update thread on stop()
+        self._consecutive_failures = 0  # Failed updates in a row, drives the retry backoff
         
         # Dash app for visualization
         self.app = dash.Dash(
@@ -54,43 +82,126 @@ class StockAnalysisApp:
         self.setup_dashboard()
     
     def update_data(self):
-        """Fetch and update stock data."""
+        """
+        Fetch and update stock data.
+        
+        Returns:
+            bool: True if new prices were fetched and applied, False if the fetch failed
+        """
+        date = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
+        time_str = (datetime.now() - timedelta(hours=8)).strftime('%H:%M')
+        target_datetime = datetime.strptime(f"{date} {time_str}", "%Y-%m-%d %H:%M")
+        
         try:
-            # Store previous data
-            self.previous_data = self.current_data.copy()
-            date = (datetime.now() - timedelta(days=2)).strftime('%Y-%m-%d')
-            time_str = (datetime.now() - timedelta(hours=8)).strftime('%H:%M')
-            target_datetime = datetime.strptime(f"{date} {time_str}", "%Y-%m-%d %H:%M")
-
-            self.current_data = self.api.get_current_prices(target_datetime)
-            print(self.current_data)
-            # Update trend analyzer
-            self.trend_analyzer.update_batch(self.current_data, self.previous_data)
-            
-            # Get historical data for charts
-            self.historical_data = self.api.get_historical_data(period="1d")
-            
-            # Check for alerts
-            triggered_alerts = self.alert_manager.check_alerts(self.current_data)
-            
-            self.last_update = int(time.time())
+            current_data = self.api.get_current_prices(target_datetime)
+        except (requests.RequestException, ConnectionError, TimeoutError) as e:
+            return self._record_update_failure("Network error fetching prices: %s", e)
+        except (IndexError, KeyError) as e:
+            # yfinance returns empty frames when a symbol has no bars for the requested time
+            return self._record_update_failure("No price data for %s: %s", target_datetime, e)
+        if not current_data:
+            # Batched downloads report failed symbols as missing rather than raising
+            return self._record_update_failure("No prices returned for %s", target_datetime)
+        
+        # Nothing below runs after a failed fetch, so the analyzer, alerts and
+        # rendered figures all keep the last good snapshot
+        self._consecutive_failures = 0
+        
+        # The API returns a fresh dict each time, so the old one can become
+        # the previous snapshot without being copied
+        self.previous_data, self.current_data = self.current_data, current_data
+        logger.debug("Fetched prices: %s", self.current_data)
+        changed_data, alerts_triggered = self._process_tick(self.current_data, self.previous_data)
+        prices_changed = bool(changed_data) or self.previous_data.keys() != self.current_data.keys()
+        
+        # Get historical data for charts; an empty result means the fetch failed,
+        # so keep showing the previous history
+        historical_data = self.api.get_historical_data(period="1d")
+        history_changed = bool(historical_data) and historical_data is not self.historical_data
+        if history_changed:
+            self.historical_data = historical_data
+        
+        self.last_update = int(time.time())
+        # Alerts can fire without a price move (newly added alerts get their
+        # first check), and the alerts panel only refreshes on a new version
+        if prices_changed or history_changed or alerts_triggered:
+            self.data_version += 1
+        return True
+    
+    def _process_tick(self, current_data, previous_data):
+        """
+        Apply a new price snapshot to the trend analyzer and alerts.
+        
+        Prices are diffed against the previous snapshot in one pass, and only
+        the stocks that moved reach the analyzer and the alert check, which
+        runs before the slower historical fetch so alerts are not delayed by it.
+        
+        Args:
+            current_data (dict): Latest price data by symbol
+            previous_data (dict): Price data from the previous update
             
-        except Exception as e:
-            pass
+        Returns:
+            tuple: (changed_data, alerts_triggered) - the entries of current_data
+                   whose price changed, and whether any alert was triggered
+        """
+        changed_data = {}
+        for symbol, data in current_data.items():
+            previous = previous_data.get(symbol)
+            if previous is None or previous.get('price') != data.get('price'):
+                changed_data[symbol] = data
+        
+        if changed_data:
+            self.trend_analyzer.update_batch(changed_data, previous_data)
+        
+        # Called even without price changes so newly added alerts get their first check
+        triggered_alerts = self.alert_manager.check_alerts_for_symbols(changed_data, current_data)
+        if triggered_alerts:
+            logger.info("%d alert(s) triggered", len(triggered_alerts))
+        
+        return changed_data, bool(triggered_alerts)
+    
+    def _record_update_failure(self, message, *args):
+        """Log a failed update and count it towards the retry backoff."""
+        self._consecutive_failures += 1
+        logger.warning(message + " (%d consecutive failures)", *args, self._consecutive_failures)
+        return False
+    
+    def _next_update_delay(self):
+        """Seconds until the next update, doubling after each consecutive failure."""
+        if not self._consecutive_failures:
+            return config.UPDATE_INTERVAL
+        backoff = config.UPDATE_INTERVAL * 2 ** min(self._consecutive_failures, 16)
+        return min(backoff, max(config.UPDATE_INTERVAL, config.MAX_UPDATE_BACKOFF))
     
     def scheduled_update(self):
         """Scheduled function to update data periodically."""
+        # Runs on a fixed cadence measured from the start of each update, so the
+        # time spent fetching does not push later updates back. start() has
+        # already done the first update.
+        next_run = time.monotonic()
         while self.is_running:
-            self.update_data()
-            time.sleep(config.UPDATE_INTERVAL)
+            next_run = max(next_run + self._next_update_delay(), time.monotonic())
+            if self._stop_event.wait(next_run - time.monotonic()):
+                break
+            try:
+                self.update_data()
+            except Exception:
+                # Unexpected errors are bugs: log them loudly, but keep the loop alive
+                logger.exception("Unexpected error while updating data")
+                self._consecutive_failures += 1
     
     def start(self):
         """Start the data update thread and run the dashboard."""
         if not self.is_running:
             self.is_running = True
+            self._stop_event.clear()
             
-            # Initial data update
-            self.update_data()
+            # Initial data update; a failure is logged and retried by the update thread
+            try:
+                self.update_data()
+            except Exception:
+                logger.exception("Unexpected error during the initial data update")
+                self._consecutive_failures += 1
             
             # Start update thread
             self.update_thread = threading.Thread(target=self.scheduled_update)
@@ -103,11 +214,20 @@ class StockAnalysisApp:
     def stop(self):
         """Stop the application."""
         self.is_running = False
+        self._stop_event.set()
         if self.update_thread:
             self.update_thread.join(timeout=5)
+        self.api.close()
+        self.alert_manager.close()
     
     def setup_dashboard(self):
         """Set up the Dash dashboard."""
+        # Both symbol dropdowns share one options list
+        symbol_options = [
+            {"label": symbol, "value": symbol}
+            for symbol in config.DEFAULT_SYMBOLS
+        ]
+        
         # App layout
         self.app.layout = dbc.Container([
             dbc.Row([
@@ -155,10 +275,7 @@ class StockAnalysisApp:
                                 dbc.Col([
                                     dbc.Select(
                                         id="stock-selector",
-                                        options=[
-                                            {"label": symbol, "value": symbol}
-                                            for symbol in config.DEFAULT_SYMBOLS
-                                        ],
+                                        options=symbol_options,
                                         value=config.DEFAULT_SYMBOLS[0]
                                     )
                                 ], width=6)
@@ -197,10 +314,7 @@ class StockAnalysisApp:
                                         dbc.Label("Symbol"),
                                         dbc.Select(
                                             id="alert-symbol",
-                                            options=[
-                                                {"label": symbol, "value": symbol}
-                                                for symbol in config.DEFAULT_SYMBOLS
-                                            ],
+                                            options=symbol_options,
                                             value=config.DEFAULT_SYMBOLS[0]
                                         )
                                     ])
@@ -253,13 +367,23 @@ class StockAnalysisApp:
                 id='interval-component',
                 interval=10 * 1000,  # in milliseconds (10 seconds)
                 n_intervals=0
-            )
+            ),
+            
+            # Data version last rendered by this client; charts listen to it
+            # instead of the interval so they only redraw when data changes
+            dcc.Store(id="data-version", data=0)
         ], fluid=True)
         
         # Callbacks
+        self.app.callback(
+            Output("data-version", "data"),
+            [Input("interval-component", "n_intervals")],
+            [State("data-version", "data")]
+        )(self.poll_data_version)
+        
         self.app.callback(
             Output("gainers-losers-chart", "figure"),
-            [Input("interval-component", "n_intervals"),
+            [Input("data-version", "data"),
              Input("refresh-button", "n_clicks"),
              Input("timeframe-selector", "value")]
         )(self.update_gainers_losers_chart)
@@ -267,14 +391,14 @@ class StockAnalysisApp:
         self.app.callback(
             Output("stock-price-chart", "figure"),
             [Input("stock-selector", "value"),
-             Input("interval-component", "n_intervals"),
+             Input("data-version", "data"),
              Input("refresh-button", "n_clicks")]
         )(self.update_stock_price_chart)
         
         self.app.callback(
             Output("stock-metrics", "children"),
             [Input("stock-selector", "value"),
-             Input("interval-component", "n_intervals"),
+             Input("data-version", "data"),
              Input("refresh-button", "n_clicks")]
         )(self.update_stock_metrics)
         
@@ -282,7 +406,7 @@ class StockAnalysisApp:
             [Output("alert-status", "children"),
              Output("alerts-list", "children")],
             [Input("add-alert-button", "n_clicks"),
-             Input("interval-component", "n_intervals")],
+             Input("data-version", "data")],
             [State("alert-symbol", "value"),
              State("alert-type", "value"),
              State("alert-threshold", "value")]
@@ -293,12 +417,46 @@ class StockAnalysisApp:
             [Input("interval-component", "n_intervals")]
         )(self.update_time_display)
     
-    def update_gainers_losers_chart(self, n_intervals=None, n_clicks=None, timeframe="one_week"):
+    def poll_data_version(self, n_intervals, client_version):
+        """Advance the client's data version, or skip the update if it is current."""
+        if client_version == self.data_version:
+            raise PreventUpdate
+        return self.data_version
+    
+    def _cached_render(self, key, build):
+        """
+        Get a rendered component for the current data version, building it at most once.
+        
+        Args:
+            key (tuple): Identifies the component and its inputs
+            build (callable): Builds the component from the current data
+            
+        Returns:
+            The cached or newly built component
+        """
+        version = self.data_version
+        if self._render_cache_version != version:
+            self._render_cache = {}
+            self._render_cache_version = version
+        
+        rendered = self._render_cache.get(key)
+        if rendered is None:
+            rendered = self._render_cache[key] = build()
+        return rendered
+    
+    def update_gainers_losers_chart(self, data_version=None, n_clicks=None, timeframe="one_week"):
         """Update the gainers and losers chart."""
         if self.trend_analyzer.last_update is None:
             # No data yet
             return go.Figure().update_layout(title="No data available yet")
         
+        return self._cached_render(
+            ("gainers_losers", timeframe),
+            lambda: self._build_gainers_losers_chart(timeframe)
+        )
+    
+    def _build_gainers_losers_chart(self, timeframe):
+        """Build the gainers and losers chart for a timeframe."""
         # Get title based on timeframe
         title = "Top Gainers and Losers"
         if timeframe == "one_week":
@@ -319,21 +477,31 @@ class StockAnalysisApp:
             title
         )
     
-    def update_stock_price_chart(self, symbol, n_intervals=None, n_clicks=None):
+    def update_stock_price_chart(self, symbol, data_version=None, n_clicks=None):
         """Update the stock price chart for the selected symbol."""
         if not symbol or symbol not in self.historical_data:
             return go.Figure().update_layout(title=f"No data available for {symbol}")
         
-        return self.visualizer.create_price_chart(
-            self.historical_data[symbol], 
-            f"Price Chart - {symbol}"
+        return self._cached_render(
+            ("price_chart", symbol),
+            lambda: self.visualizer.create_price_chart(
+                self.historical_data[symbol], 
+                f"Price Chart - {symbol}"
+            )
         )
     
-    def update_stock_metrics(self, symbol, n_intervals=None, n_clicks=None):
+    def update_stock_metrics(self, symbol, data_version=None, n_clicks=None):
         """Update the stock metrics display."""
         if not symbol or symbol not in self.current_data:
             return "No data available"
         
+        return self._cached_render(
+            ("stock_metrics", symbol),
+            lambda: self._build_stock_metrics(symbol)
+        )
+    
+    def _build_stock_metrics(self, symbol):
+        """Build the metrics table for a symbol."""
         # Get current data
         current = self.current_data.get(symbol, {})
         
@@ -381,7 +549,7 @@ class StockAnalysisApp:
             size="sm"
         )
     
-    def handle_alerts(self, n_clicks, n_intervals, symbol, alert_type, threshold):
+    def handle_alerts(self, n_clicks, data_version, symbol, alert_type, threshold):
         """Handle alert creation and display."""
         ctx = dash.callback_context
         alert_message = ""
@@ -452,5 +620,6 @@ class StockAnalysisApp:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
     app = StockAnalysisApp()
     app.start()
\ No newline at end of file
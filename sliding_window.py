@@ -1,7 +1,7 @@
 import pandas as pd
 import numpy as np
-from collections import deque
 import time
+from collections import deque
 
 class SlidingWindow:
     """
@@ -19,24 +19,71 @@ class SlidingWindow:
             symbols (list): List of stock symbols to track
         """
         self.window_size = window_size
-        self.symbols = symbols or []
-        self.windows = {}  # Maps symbol to its data window
+        self.symbols = []
+        
+        # All windows live in one (n_symbols, window_size) matrix so metrics
+        # can be reduced across every symbol at once. Each row is a ring
+        # buffer; unfilled slots hold NaN.
+        self._symbol_index = {}  # Maps symbol to its row in the matrices
+        self._price_matrix = np.empty((0, window_size), dtype=np.float64)
+        self._timestamp_matrix = np.zeros((0, window_size), dtype=np.int64)
+        self._head = np.zeros(0, dtype=np.intp)  # Next write position per row
+        self._count = np.zeros(0, dtype=np.intp)  # Points held per row
+        
+        # Running window statistics, updated as points enter and leave so
+        # metrics never rescan a window. Sums are taken relative to each
+        # row's first price to limit cancellation in the variance.
+        self._shift = np.zeros(0, dtype=np.float64)
+        self._sum = np.zeros(0, dtype=np.float64)
+        self._sum_sq = np.zeros(0, dtype=np.float64)
+        self._seq = np.zeros(0, dtype=np.int64)  # Points ever added per row
+        
+        # Monotonic deques of (price, seq): the front is the window minimum
+        # (ascending deque) or maximum (descending deque)
+        self._min_deques = []
+        self._max_deques = []
         
         # Initialize windows for each symbol
-        for symbol in self.symbols:
-            self.windows[symbol] = deque(maxlen=window_size)
+        for symbol in symbols or []:
+            self.add_symbol(symbol)
     
     def add_symbol(self, symbol):
         """Add a new symbol to track."""
-        if symbol not in self.windows:
-            self.windows[symbol] = deque(maxlen=self.window_size)
+        if symbol not in self._symbol_index:
+            self._symbol_index[symbol] = len(self.symbols)
             self.symbols.append(symbol)
+            self._price_matrix = np.vstack(
+                (self._price_matrix, np.full((1, self.window_size), np.nan)))
+            self._timestamp_matrix = np.vstack(
+                (self._timestamp_matrix, np.zeros((1, self.window_size), dtype=np.int64)))
+            self._head = np.append(self._head, 0)
+            self._count = np.append(self._count, 0)
+            self._shift = np.append(self._shift, 0.0)
+            self._sum = np.append(self._sum, 0.0)
+            self._sum_sq = np.append(self._sum_sq, 0.0)
+            self._seq = np.append(self._seq, 0)
+            self._min_deques.append(deque())
+            self._max_deques.append(deque())
     
     def remove_symbol(self, symbol):
         """Remove a symbol from tracking."""
-        if symbol in self.windows:
-            del self.windows[symbol]
-            self.symbols.remove(symbol)
+        row = self._symbol_index.pop(symbol, None)
+        if row is not None:
+            self._price_matrix = np.delete(self._price_matrix, row, axis=0)
+            self._timestamp_matrix = np.delete(self._timestamp_matrix, row, axis=0)
+            self._head = np.delete(self._head, row)
+            self._count = np.delete(self._count, row)
+            self._shift = np.delete(self._shift, row)
+            self._sum = np.delete(self._sum, row)
+            self._sum_sq = np.delete(self._sum_sq, row)
+            self._seq = np.delete(self._seq, row)
+            del self._min_deques[row]
+            del self._max_deques[row]
+            del self.symbols[row]
+            
+            # Rows after the removed one shift up by one
+            for i in range(row, len(self.symbols)):
+                self._symbol_index[self.symbols[i]] = i
     
     def update(self, symbol, price, timestamp=None):
         """
@@ -50,14 +97,67 @@ class SlidingWindow:
         if timestamp is None:
             timestamp = int(time.time())
         
-        if symbol not in self.windows:
+        if symbol not in self._symbol_index:
             self.add_symbol(symbol)
+        row = self._symbol_index[symbol]
+        
+        price = float(price)
+        head = self._head[row]
+        count = self._count[row]
+        if count == 0:
+            self._shift[row] = price
+        shift = self._shift[row]
+        
+        # Overwrite the oldest slot once the window is full, retiring it from the sums
+        if count == self.window_size:
+            evicted = self._price_matrix[row, head] - shift
+            self._sum[row] -= evicted
+            self._sum_sq[row] -= evicted * evicted
+        else:
+            self._count[row] = count + 1
+        self._price_matrix[row, head] = price
+        self._timestamp_matrix[row, head] = timestamp
+        head = self._head[row] = (head + 1) % self.window_size
         
-        # Add data point to the window
-        self.windows[symbol].append({
-            'price': price,
-            'timestamp': timestamp
-        })
+        if head == 0 and count == self.window_size:
+            # Once per full pass over the ring, recompute the sums exactly so
+            # rounding error from the add/subtract updates cannot accumulate
+            self._resync_sums(row)
+        else:
+            offset = price - shift
+            self._sum[row] += offset
+            self._sum_sq[row] += offset * offset
+        
+        # Drop entries the new price dominates, then those that left the window
+        seq = int(self._seq[row])
+        self._seq[row] = seq + 1
+        oldest = seq - self.window_size
+        min_deque = self._min_deques[row]
+        while min_deque and min_deque[-1][0] >= price:
+            min_deque.pop()
+        min_deque.append((price, seq))
+        if min_deque[0][1] <= oldest:
+            min_deque.popleft()
+        max_deque = self._max_deques[row]
+        while max_deque and max_deque[-1][0] <= price:
+            max_deque.pop()
+        max_deque.append((price, seq))
+        if max_deque[0][1] <= oldest:
+            max_deque.popleft()
+    
+    def _resync_sums(self, row):
+        """
+        Recompute a full row's running sums from its prices.
+        
+        The sums are re-centred on the window mean, which keeps the variance
+        formula well conditioned as prices drift away from the old shift.
+        """
+        prices = self._price_matrix[row]
+        shift = float(prices.mean())
+        offsets = prices - shift
+        self._shift[row] = shift
+        self._sum[row] = offsets.sum()
+        self._sum_sq[row] = offsets @ offsets
     
     def update_batch(self, data_dict):
         """
@@ -69,19 +169,54 @@ class SlidingWindow:
         for symbol, data in data_dict.items():
             self.update(symbol, data['price'], data.get('timestamp'))
     
+    def _ordered_row(self, matrix, row):
+        """
+        Get a row's populated slots in chronological order.
+        
+        Returns a view unless the ring buffer has wrapped around.
+        """
+        count = self._count[row]
+        if count < self.window_size:
+            return matrix[row, :count]
+        head = self._head[row]
+        if head == 0:
+            return matrix[row]
+        return np.concatenate((matrix[row, head:], matrix[row, :head]))
+    
+    def get_window_arrays(self, symbol):
+        """
+        Get the current window data for a symbol as NumPy arrays.
+        
+        Args:
+            symbol (str): Stock symbol
+        
+        Returns:
+            tuple: (prices, timestamps) arrays in chronological order; empty if
+                   the symbol is not tracked. They may be views into the window
+                   and must not be modified.
+        """
+        row = self._symbol_index.get(symbol)
+        if row is None:
+            return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+        return (self._ordered_row(self._price_matrix, row),
+                self._ordered_row(self._timestamp_matrix, row))
+    
     def get_window(self, symbol):
         """
         Get the current window data for a symbol.
         
+        Kept for callers that expect one dict per data point; prefer
+        get_window_arrays, which avoids building the dicts.
+        
         Args:
             symbol (str): Stock symbol
         
         Returns:
             list: List of data points in the window
         """
-        if symbol in self.windows:
-            return list(self.windows[symbol])
-        return []
+        prices, timestamps = self.get_window_arrays(symbol)
+        return [{'price': price, 'timestamp': timestamp}
+                for price, timestamp in zip(prices.tolist(), timestamps.tolist())]
     
     def calculate_metrics(self, symbol):
         """
@@ -93,37 +228,41 @@ class SlidingWindow:
         Returns:
             dict: Dictionary containing calculated metrics
         """
-        if symbol not in self.windows or not self.windows[symbol]:
+        row = self._symbol_index.get(symbol)
+        if row is None or not self._count[row]:
             return {}
         
-        window = list(self.windows[symbol])
-        prices = [point['price'] for point in window]
+        count = int(self._count[row])
+        if count < 2:
+            return {'symbol': symbol, 'window_size': count, 'insufficient_data': True}
         
-        if not prices or len(prices) < 2:
-            return {'symbol': symbol, 'window_size': len(prices), 'insufficient_data': True}
+        # Read the newest, oldest and fifth-newest points straight from the ring
+        W = self.window_size
+        head = self._head[row]
+        prices = self._price_matrix[row]
+        current_price = float(prices[(head - 1) % W])
+        start_price = float(prices[0 if count < W else head])
         
-        # Calculate metrics
-        current_price = prices[-1]
-        start_price = prices[0]
-        max_price = max(prices)
-        min_price = min(prices)
-        avg_price = sum(prices) / len(prices)
+        # Extremes, mean and volatility come from the running state
+        max_price = self._max_deques[row][0][0]
+        min_price = self._min_deques[row][0][0]
+        mean_offset = self._sum[row] / count
+        avg_price = float(self._shift[row] + mean_offset)
+        volatility = float(np.sqrt(max(self._sum_sq[row] / count - mean_offset * mean_offset, 0.0)))
         
         # Percentage change over the window
         pct_change = ((current_price - start_price) / start_price) * 100
         
-        # Calculate volatility (standard deviation)
-        volatility = np.std(prices)
-        
         # Calculate simple momentum (rate of change)
-        if len(prices) >= 5:
-            momentum = ((prices[-1] - prices[-5]) / prices[-5]) * 100
+        if count >= 5:
+            back_price = prices[(head - 5) % W]
+            momentum = float((current_price - back_price) / back_price) * 100
         else:
             momentum = 0
         
         return {
             'symbol': symbol,
-            'window_size': len(prices),
+            'window_size': count,
             'current_price': current_price,
             'start_price': start_price,
             'max_price': max_price,
@@ -132,9 +271,87 @@ class SlidingWindow:
             'pct_change': pct_change,
             'volatility': volatility,
             'momentum': momentum,
-            'timestamp': window[-1]['timestamp']
+            'timestamp': int(self._timestamp_matrix[row, (self._head[row] - 1) % self.window_size])
+        }
+    
+    def metrics_arrays(self):
+        """
+        Calculate metrics for every symbol with at least two data points as arrays.
+        
+        Each statistic is computed with one NumPy operation across all symbols
+        rather than one call per symbol, and is returned as a column aligned
+        with the symbols column.
+        
+        Returns:
+            dict: Dictionary mapping metric names to arrays with one entry per
+                  symbol; 'symbol' holds the symbols themselves
+        """
+        counts = self._count
+        rows = np.flatnonzero(counts >= 2)
+        W = self.window_size
+        heads = self._head[rows]
+        sizes = counts[rows]
+        
+        # Mean and volatility from the running sums, extremes from the deque fronts
+        mean_offsets = self._sum[rows] / sizes
+        avg_prices = self._shift[rows] + mean_offsets
+        volatilities = np.sqrt(np.maximum(self._sum_sq[rows] / sizes - mean_offsets * mean_offsets, 0.0))
+        row_list = rows.tolist()
+        max_prices = np.array([self._max_deques[row][0][0] for row in row_list], dtype=np.float64)
+        min_prices = np.array([self._min_deques[row][0][0] for row in row_list], dtype=np.float64)
+        
+        # Gather the newest, oldest and fifth-newest points of every ring in
+        # one indexing pass, without copying the rows themselves
+        last_cols = (heads - 1) % W
+        cols = np.stack((last_cols, np.where(sizes < W, 0, heads), (heads - 5) % W))
+        current_prices, start_prices, back_prices = self._price_matrix[rows, cols]
+        timestamps = self._timestamp_matrix[rows, last_cols]
+        
+        pct_changes = (current_prices - start_prices) / start_prices * 100
+        momenta = np.where(sizes >= 5,
+                           (current_prices - back_prices) / back_prices * 100, 0.0)
+        
+        return {
+            'symbol': np.array([self.symbols[row] for row in row_list], dtype=object),
+            'window_size': sizes,
+            'current_price': current_prices,
+            'start_price': start_prices,
+            'max_price': max_prices,
+            'min_price': min_prices,
+            'avg_price': avg_prices,
+            'pct_change': pct_changes,
+            'volatility': volatilities,
+            'momentum': momenta,
+            'timestamp': timestamps
         }
     
+    @staticmethod
+    def metrics_records(arrays, positions=None):
+        """
+        Build per-symbol metric dictionaries from the output of metrics_arrays.
+        
+        Args:
+            arrays (dict): Metric columns as returned by metrics_arrays
+            positions (array-like): Positions to build, in order; None for all
+            
+        Returns:
+            list: List of metric dictionaries
+        """
+        if positions is not None:
+            arrays = {key: column[positions] for key, column in arrays.items()}
+        
+        # Convert each column to Python scalars in one call rather than per element
+        keys = list(arrays)
+        columns = [arrays[key].tolist() for key in keys]
+        
+        # Windows too short for momentum report the integer 0, as calculate_metrics
+        # does, so it is not mistaken for a measured 0.0%
+        if 'momentum' in arrays and 'window_size' in arrays:
+            i = keys.index('momentum')
+            columns[i] = [momentum if size >= 5 else 0
+                          for momentum, size in zip(columns[i], columns[keys.index('window_size')])]
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+    
     def calculate_all_metrics(self):
         """
         Calculate metrics for all symbols.
@@ -143,9 +360,62 @@ class SlidingWindow:
             dict: Dictionary mapping symbols to their metrics
         """
         metrics = {}
-        for symbol in self.symbols:
-            metrics[symbol] = self.calculate_metrics(symbol)
-        return metrics
+        counts = self._count
+        
+        # Symbols without data or with a single point get the same
+        # placeholders as calculate_metrics
+        for row in np.flatnonzero(counts < 2):
+            symbol = self.symbols[row]
+            metrics[symbol] = ({'symbol': symbol, 'window_size': 1, 'insufficient_data': True}
+                               if counts[row] else {})
+        
+        for record in self.metrics_records(self.metrics_arrays()):
+            metrics[record['symbol']] = record
+        
+        # Keep the original symbol ordering
+        return {symbol: metrics[symbol] for symbol in self.symbols}
+    
+    def _rank_performers(self, n, metric, descending):
+        """
+        Select the n best or worst symbols by a metric with a partial sort.
+        
+        Metric dicts are built only for the symbols returned.
+        
+        Args:
+            n (int): Number of symbols to return
+            metric (str): Metric to rank by
+            descending (bool): Rank largest values first
+        
+        Returns:
+            list: Metrics dicts of the selected symbols in rank order
+        """
+        # Rank straight from the metric columns; symbols without enough data
+        # are not in them
+        arrays = self.metrics_arrays()
+        count = arrays['symbol'].size
+        if n <= 0 or not count:
+            return []
+        
+        # Negate for descending order so both directions select the smallest keys
+        keys = arrays.get(metric)
+        keys = np.zeros(count) if keys is None else keys.astype(np.float64)
+        if descending:
+            keys = -keys
+        
+        # Partitioning finds the n-th smallest key in O(S); only the keys up to
+        # it get sorted. Ties at the cut-off are taken in symbol order so the
+        # result matches a full stable sort.
+        if n < len(keys):
+            cutoff = np.partition(keys, n - 1)[n - 1]
+            below = np.flatnonzero(keys < cutoff)
+            ties = np.flatnonzero(keys == cutoff)[:n - below.size]
+            selected = np.sort(np.concatenate((below, ties)))
+            selected = selected[np.argsort(keys[selected], kind='stable')]
+        else:
+            selected = np.argsort(keys, kind='stable')
+        
+        # Only the selected symbols get a metrics dict
+        return self.metrics_records(arrays, selected)
     
     def get_top_performers(self, n=5, metric='pct_change'):
         """
@@ -158,20 +428,7 @@ class SlidingWindow:
         Returns:
             list: List of top performing stocks and their metrics
         """
-        metrics = self.calculate_all_metrics()
-        
-        # Filter out insufficient data and sort
-        valid_metrics = {k: v for k, v in metrics.items() 
-                         if v and not v.get('insufficient_data', False)}
-        
-        # Sort by the specified metric in descending order
-        sorted_symbols = sorted(valid_metrics.keys(), 
-                              key=lambda s: valid_metrics[s].get(metric, 0), 
-                              reverse=True)
-        
-        # Return the top n
-        top_symbols = sorted_symbols[:n]
-        return [valid_metrics[s] for s in top_symbols]
+        return self._rank_performers(n, metric, descending=True)
     
     def get_bottom_performers(self, n=5, metric='pct_change'):
         """
@@ -184,16 +441,4 @@ class SlidingWindow:
         Returns:
             list: List of bottom performing stocks and their metrics
         """
-        metrics = self.calculate_all_metrics()
-        
-        # Filter out insufficient data and sort
-        valid_metrics = {k: v for k, v in metrics.items() 
-                         if v and not v.get('insufficient_data', False)}
-        
-        # Sort by the specified metric in ascending order
-        sorted_symbols = sorted(valid_metrics.keys(), 
-                              key=lambda s: valid_metrics[s].get(metric, 0))
-        
-        # Return the bottom n
-        bottom_symbols = sorted_symbols[:n]
-        return [valid_metrics[s] for s in bottom_symbols]
+        return self._rank_performers(n, metric, descending=False)
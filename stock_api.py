@@ -1,57 +1,163 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 class StockAPI:
     
-    def __init__(self, default_symbols=None):
+    def __init__(self, default_symbols=None, cache_expiry=60, max_workers=8, fetch_timeout=10,
+                 cache_dir=None):
         
         if default_symbols is None:
             self.default_symbols = ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'TSLA', 'NVDA', 'JPM', 'V', 'WMT']
         else:
             self.default_symbols = default_symbols
+        self._default_symbols_set = frozenset(self.default_symbols)  # Cache key part for the default symbols
 
         self.cache = {}  # Cache to store recent data
-        self.cache_expiry = 60  # Cache expiry in seconds
+        self.cache_expiry = cache_expiry  # Cache expiry in seconds
+        self.cache_retention = cache_expiry * 10  # Expired entries are kept this long as a base for incremental refreshes
+        self.failed_retry_interval = self.cache_retention  # Symbols that failed to download are re-fetched in full at most this often
+        self._failed_fetches = {}  # (symbol, period, interval) -> time of the last failed full fetch
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.max_workers = max_workers  # Threads used for concurrent fetches
+        self.fetch_timeout = fetch_timeout  # Seconds a single request may take
+        self.cache_dir = cache_dir  # Directory for on-disk copies of price histories; None disables them
+        
+        # Long-lived pool so refreshes reuse warm worker threads
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stock-fetch")
         
         # Historical snapshots for different timeframes
         self.timeframe_data = {
             'one_week': {},     # Snapshot from 1 week ago
             'two_week': {}      # Snapshot from 2 weeks ago
         }
+        self._snapshot_date = None  # Date the snapshots were last fetched for
+        self._snapshot_pending = []  # Symbols still without a snapshot for that date
+
+    def _download(self, symbols, with_change_pct=False, **kwargs):
+        """
+        Download price history for several symbols in one batched call.
+        
+        Args:
+            symbols (list): Stock symbols to fetch
+            with_change_pct (bool): Add the change_pct and symbol columns
+            **kwargs: Range arguments passed to yf.download (start/end or period, interval)
+        
+        Returns:
+            dict: Dictionary mapping each symbol with data to its own DataFrame
+        """
+        # Each download fans out over its own threads, one request per symbol
+        frame = yf.download(list(symbols), group_by='ticker', progress=False,
+                            threads=min(len(symbols), self.max_workers) or True,
+                            auto_adjust=True, timeout=self.fetch_timeout, **kwargs)
+        
+        # A download where every symbol failed can come back with no columns at all
+        if frame.empty:
+            return {}
+        
+        # Older yfinance versions return flat columns when only one symbol is requested
+        if not isinstance(frame.columns, pd.MultiIndex):
+            if len(symbols) != 1:
+                return {}
+            frame.columns = pd.MultiIndex.from_product([list(symbols), frame.columns])
+        available = set(frame.columns.get_level_values(0))
+        
+        # Percentage changes for every symbol in one pass over the wide Close
+        # columns. Forward-filling first makes a symbol's change after a missing
+        # bar relative to its previous bar, as if computed on its own rows.
+        if with_change_pct:
+            change_pct = frame.xs('Close', level=1, axis=1).ffill().pct_change() * 100
+        
+        # Rows are aligned across symbols, so drop the ones a symbol has no bar for;
+        # failed downloads come back empty rather than raising
+        data = {}
+        for symbol in symbols:
+            if symbol not in available:
+                continue
+            hist = frame[symbol].dropna(how='all')
+            if hist.empty:
+                continue
+            if with_change_pct:
+                hist['change_pct'] = change_pct[symbol]
+                hist['symbol'] = symbol
+            data[symbol] = hist
+        return data
 
     def get_current_prices(self, target_datetime, symbols=None):
-        current_data = {}
-        for symbol in self.default_symbols:
-            ticker = yf.Ticker(symbol)
+        """
+        Get current prices and refresh the one- and two-week snapshots.
+        
+        Args:
+            target_datetime (datetime): Point in time treated as "now"
+            symbols (list): Unused; prices are fetched for the default symbols
+        
+        Returns:
+            dict: Dictionary mapping symbols to {symbol, price, timestamp} dicts
+        """
+        # The snapshots come from daily bars, so each symbol only needs fetching
+        # once per target date. The current prices and the one daily download
+        # covering both past snapshots are independent, so they are fetched concurrently.
+        snapshot_date = target_datetime.date()
+        if snapshot_date != self._snapshot_date:
+            self._snapshot_date = snapshot_date
+            self._snapshot_pending = list(self.default_symbols)
+        pending = self._snapshot_pending
+        daily_future = None
+        if pending:
+            daily_future = self._executor.submit(self._download, pending,
+                                                 start=target_datetime - timedelta(days=15),
+                                                 end=target_datetime - timedelta(days=5))
+
+        current = self._download(self.default_symbols,
+                                 start=target_datetime - timedelta(minutes=1),
+                                 end=target_datetime,
+                                 interval="1m")
 
-            # current data
-            hist = ticker.history(start=target_datetime - timedelta(minutes=1), 
-                                    end=target_datetime, 
-                                    interval="1m")
+        # Symbols without a bar for a point in time are left out of that snapshot
+        current_data = {}
+        timestamp = int(target_datetime.timestamp())
+        for symbol, hist in current.items():
             current_data[symbol] = {
                                         "symbol": symbol,
-                                        "price": hist.iloc[0,3],
-                                        "timestamp": target_datetime
+                                        "price": hist['Close'].iloc[0],
+                                        "timestamp": timestamp
                                     }
 
+        one_week_datetime = target_datetime - timedelta(days=7)
+        two_week_datetime = target_datetime - timedelta(days=14)
+        one_week_timestamp = int(one_week_datetime.timestamp())
+        two_week_timestamp = int(two_week_datetime.timestamp())
+        
+        # Snapshots already fetched for this date keep their prices; only the timestamps move
+        for entry in self.timeframe_data['one_week'].values():
+            entry['timestamp'] = one_week_timestamp
+        for entry in self.timeframe_data['two_week'].values():
+            entry['timestamp'] = two_week_timestamp
+        if daily_future is None:
+            return current_data
+        daily = daily_future.result()
 
-            # one week old data
-            hist = ticker.history(start = target_datetime - timedelta(days=7), 
-                                    end = target_datetime - timedelta(days=6))                
-            self.timeframe_data['one_week'][symbol] = {'price': hist['Close'].iloc[0],
-                            'timestamp': int((target_datetime - timedelta(days=7)).timestamp()),
+        # Take each snapshot from the daily bar nearest its date
+        targets = pd.DatetimeIndex([one_week_datetime, two_week_datetime]).normalize()
+        for symbol, hist in daily.items():
+            index = hist.index
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            one_week_row, two_week_row = index.get_indexer(targets, method='nearest')
+            closes = hist['Close']
+            self.timeframe_data['one_week'][symbol] = {'price': closes.iloc[one_week_row],
+                            'timestamp': one_week_timestamp,
                             'symbol': symbol}
-
-
-            # two week old data
-            hist = ticker.history(start = target_datetime - timedelta(days=14), 
-                                    end = target_datetime - timedelta(days=13))                
-            self.timeframe_data['two_week'][symbol] = {'price': hist['Close'].iloc[0],
-                            'timestamp': int((target_datetime - timedelta(days=14)).timestamp()),
+            self.timeframe_data['two_week'][symbol] = {'price': closes.iloc[two_week_row],
+                            'timestamp': two_week_timestamp,
                             'symbol': symbol}
-
+        
+        # Symbols the download failed for are retried on the next call
+        self._snapshot_pending = [symbol for symbol in pending if symbol not in daily]
 
         return current_data        
     
@@ -68,32 +174,180 @@ class StockAPI:
             dict: Dictionary mapping symbols to pandas DataFrames with historical data
         """
         symbols = symbols or self.default_symbols
-        cache_key = f"{','.join(sorted(symbols))}-{period}-{interval}"
+        symbol_set = (self._default_symbols_set if symbols is self.default_symbols
+                      else frozenset(symbols))
+        cache_key = (symbol_set, period, interval)
+        now = time.time()
         
         # Check if data is in cache and not expired
-        if cache_key in self.cache:
-            cache_time, cache_data = self.cache[cache_key]
-            if time.time() - cache_time < self.cache_expiry:
-                return cache_data
+        cached = self.cache.get(cache_key)
+        if cached is None and self.cache_dir:
+            # After a restart the on-disk copies stand in for the in-memory cache
+            cached = self._load_disk_cache(symbols, period, interval)
+            if cached is not None:
+                self.cache[cache_key] = cached
+        if cached is not None and now - cached[0] < self.cache_expiry:
+            self.cache_stats['hits'] += 1
+            return cached[1]
+        self.cache_stats['misses'] += 1
+        
+        # Drop entries too old to refresh incrementally so the cache does not
+        # grow with every key ever requested
+        self.cache = {key: entry for key, entry in self.cache.items()
+                      if now - entry[0] < self.cache_retention}
         
         try:
-            data = {}
-            for symbol in symbols:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period=period, interval=interval)
-                
-                if not hist.empty:
-                    # Calculate percentage change
-                    hist['change_pct'] = hist['Close'].pct_change() * 100
-                    hist['symbol'] = symbol
-                    data[symbol] = hist
+            if cached is not None and cached[1]:
+                # Only fetch the bars added since the cached copy
+                data = self._refresh_history(cached[1], symbols, period, interval)
+            else:
+                # Fetch every symbol's history in one batched download
+                data = self._download(symbols, with_change_pct=True, period=period, interval=interval)
             
             # Store in cache
             self.cache[cache_key] = (time.time(), data)
+            if self.cache_dir and data:
+                self._save_disk_cache(data, cached[1] if cached is not None else {}, period, interval)
             return data
         except Exception as e:
             return {}
     
+    def _disk_cache_path(self, symbol, period, interval):
+        """Path of the on-disk copy of a symbol's price history."""
+        return os.path.join(self.cache_dir, f"{symbol}_{period}_{interval}.parquet")
+    
+    def _load_disk_cache(self, symbols, period, interval):
+        """
+        Load price histories saved by an earlier run.
+        
+        Args:
+            symbols (list): Stock symbols to load
+            period (str): Period the histories were fetched for
+            interval (str): Data point interval
+        
+        Returns:
+            tuple: (fetch time, data) in the in-memory cache format, or None if
+                   no usable copy exists. The fetch time is the oldest file's
+                   modification time, or already expired if a symbol is missing,
+                   so that a refresh fetches it.
+        """
+        now = time.time()
+        data = {}
+        fetched_at = now
+        for symbol in symbols:
+            path = self._disk_cache_path(symbol, period, interval)
+            try:
+                modified = os.path.getmtime(path)
+                if now - modified >= self.cache_retention:
+                    continue
+                data[symbol] = pd.read_parquet(path)
+            except (OSError, ValueError, ImportError):
+                continue
+            fetched_at = min(fetched_at, modified)
+        
+        if not data:
+            return None
+        if len(data) < len(symbols):
+            fetched_at = min(fetched_at, now - self.cache_expiry)
+        return (fetched_at, data)
+    
+    def _save_disk_cache(self, data, previous_data, period, interval):
+        """
+        Write the price histories that changed since the last fetch to disk.
+        
+        Unchanged copies only have their modification time bumped. The cache
+        directory is created on the first write.
+        
+        Args:
+            data (dict): Freshly fetched histories by symbol
+            previous_data (dict): Histories they replace, by symbol
+            period (str): Period the histories were fetched for
+            interval (str): Data point interval
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            return
+        
+        for symbol, hist in data.items():
+            path = self._disk_cache_path(symbol, period, interval)
+            try:
+                if previous_data.get(symbol) is hist:
+                    # No new bars, so the saved copy is current as of now
+                    os.utime(path)
+                else:
+                    # Write to a temporary file first so readers never see a partial copy
+                    hist.to_parquet(path + ".tmp")
+                    os.replace(path + ".tmp", path)
+            except (OSError, ValueError, ImportError):
+                pass
+    
+    def _annotate_history(self, symbol, hist):
+        """Add the derived columns to a symbol's price history in place."""
+        # Calculate percentage change
+        hist['change_pct'] = hist['Close'].pct_change() * 100
+        hist['symbol'] = symbol
+    
+    def _refresh_history(self, cached_data, symbols, period, interval):
+        """
+        Bring cached price histories up to date by fetching only the newest bars.
+        
+        The download starts at the oldest "last bar" among the cached symbols, so
+        between bar boundaries or while the market is closed it returns nothing
+        new and the cached frames are reused unchanged. Symbols missing from the
+        cache are fetched in full, but after a failed attempt only once every
+        failed_retry_interval seconds.
+        
+        Args:
+            cached_data (dict): Previously fetched histories by symbol
+            symbols (list): Stock symbols to fetch data for
+            period (str): Period of data to fetch for symbols missing from the cache
+            interval (str): Data point interval
+        
+        Returns:
+            dict: Dictionary mapping symbols to up-to-date DataFrames; the cached
+                  dict itself if no symbol gained a bar or was newly fetched
+        """
+        # Symbols that failed last time get a full fetch, unless a recent retry failed too
+        now = time.time()
+        failed = self._failed_fetches
+        retry = [symbol for symbol in symbols if symbol not in cached_data
+                 and now - failed.get((symbol, period, interval), 0) >= self.failed_retry_interval]
+        data = (self._download(retry, with_change_pct=True, period=period, interval=interval)
+                if retry else {})
+        for symbol in retry:
+            if symbol in data:
+                failed.pop((symbol, period, interval), None)
+            else:
+                failed[(symbol, period, interval)] = now
+        fetched_missing = bool(data)
+        
+        cached_symbols = [symbol for symbol in symbols if symbol in cached_data]
+        if cached_symbols:
+            since = min(cached_data[symbol].index[-1] for symbol in cached_symbols)
+            fresh_data = self._download(cached_symbols, start=since, interval=interval)
+        else:
+            fresh_data = {}
+        
+        for symbol in cached_symbols:
+            hist = cached_data[symbol]
+            fresh = fresh_data.get(symbol)
+            if fresh is None or fresh.index[-1] <= hist.index[-1]:
+                data[symbol] = hist
+                continue
+            
+            # New bars replace any overlapping cached ones; the window keeps its
+            # original span so it slides forward instead of growing
+            span = hist.index[-1] - hist.index[0]
+            merged = pd.concat((hist.loc[hist.index < fresh.index[0], fresh.columns], fresh))
+            merged = merged.loc[merged.index >= merged.index[-1] - span]
+            self._annotate_history(symbol, merged)
+            data[symbol] = merged
+        
+        if not fetched_missing and all(data[symbol] is cached_data[symbol] for symbol in cached_symbols):
+            return cached_data
+        return data
+    
     def get_price_changes(self, symbols=None, period="1d"):
         """
         Calculate price changes over a period for a list of stock symbols.
@@ -107,23 +361,35 @@ class StockAPI:
         """
         
         data = self.get_historical_data(self.default_symbols, period=period)
-        changes = {}
+        if not data:
+            return {}
         
-        for symbol, hist in data.items():
-            if not hist.empty:
-                start_price = hist['Close'].iloc[0]
-                end_price = hist['Close'].iloc[-1]
-                pct_change = ((end_price - start_price) / start_price) * 100
-                
-                changes[symbol] = {
-                    'symbol': symbol,
-                    'change_pct': pct_change,
-                    'start_price': start_price,
-                    'end_price': end_price,
-                    'timestamp': int(time.time())
-                }
-        
-        return changes
+        # First and last closes for all symbols, read straight from the NumPy
+        # buffers behind the Close columns, then one vectorized change computation
+        symbols = list(data)
+        closes = [data[symbol]['Close'].to_numpy() for symbol in symbols]
+        start_prices = np.fromiter((close[0] for close in closes),
+                                   dtype=np.float64, count=len(symbols))
+        end_prices = np.fromiter((close[-1] for close in closes),
+                                 dtype=np.float64, count=len(symbols))
+        pct_changes = (end_prices - start_prices) / start_prices * 100
+        
+        timestamp = int(time.time())
+        return {
+            symbol: {
+                'symbol': symbol,
+                'change_pct': pct_change,
+                'start_price': start_price,
+                'end_price': end_price,
+                'timestamp': timestamp
+            }
+            for symbol, start_price, end_price, pct_change in zip(
+                symbols, start_prices.tolist(), end_prices.tolist(), pct_changes.tolist())
+        }
     
     def get_timeframe_data(self, timeframe):
-        return self.timeframe_data[timeframe]
\ No newline at end of file
+        return self.timeframe_data[timeframe]
+
+    def close(self):
+        """Shut down the fetch thread pool."""
+        self._executor.shutdown(wait=False)
@@ -1,11 +1,123 @@
+import threading
 import time
-from datetime import datetime, timedelta
-import pandas as pd
 import numpy as np
 
 from heap import StockMinHeap, StockMaxHeap
 from sliding_window import SlidingWindow
 
+
+def _pct_changes(current, reference):
+    """
+    Calculate percentage changes of current prices against several reference prices.
+    
+    Args:
+        current (np.ndarray): Current price of each symbol, shape (N,)
+        reference (np.ndarray): Reference prices, shape (N, K); NaN where missing
+        
+    Returns:
+        tuple: (percentage changes of shape (N, K), mask of the entries with a
+                positive reference price); masked-out changes are 0
+    """
+    valid = reference > 0
+    pct_changes = np.zeros(reference.shape)
+    np.divide(current[:, np.newaxis] - reference, reference, out=pct_changes, where=valid)
+    pct_changes *= 100
+    return pct_changes, valid
+
+
+def _scan_breakouts(current, avg, threshold_pct, scratch=None):
+    """
+    Find the prices outside a percentage band around their averages.
+    
+    Args:
+        current (np.ndarray): Current price of each symbol
+        avg (np.ndarray): Average price of each symbol
+        threshold_pct (float): Half-width of the band as a percentage of the average
+        scratch (tuple): Optional (float, bool, bool) work buffers with at least
+                         len(current) elements, reused instead of allocating
+        
+    Returns:
+        tuple: (positions of the breakouts, whether each one is upward,
+                distance of each one from its average in percent)
+    """
+    size = current.size
+    if scratch is None:
+        bound = np.empty(size)
+        upward = np.empty(size, dtype=bool)
+        breaking = np.empty(size, dtype=bool)
+    else:
+        bound, upward, breaking = (buffer[:size] for buffer in scratch)
+    
+    # Compare every price against the band around its average at once;
+    # the band multipliers are scalars computed a single time, and one buffer
+    # holds the upper and then the lower bound
+    up_mul = 1 + threshold_pct/100
+    dn_mul = 1 - threshold_pct/100
+    np.multiply(avg, up_mul, out=bound)
+    np.greater(current, bound, out=upward)
+    np.multiply(avg, dn_mul, out=bound)
+    np.less(current, bound, out=breaking)
+    breaking |= upward
+    positions = np.flatnonzero(breaking)
+    
+    # Distance from the average for the breakouts only, computed in place
+    breakout_avg = avg[positions]
+    breakout_pcts = current[positions]
+    breakout_pcts -= breakout_avg
+    np.abs(breakout_pcts, out=breakout_pcts)
+    breakout_pcts /= breakout_avg
+    breakout_pcts *= 100
+    return positions, upward[positions], breakout_pcts
+
+
+def _select_extremes(values, k_low, k_high):
+    """
+    Find the positions of the smallest and the largest values with one partial sort.
+    
+    Args:
+        values (np.ndarray): Values to select from
+        k_low (int): Number of smallest values to select
+        k_high (int): Number of largest values to select
+        
+    Returns:
+        tuple: (positions of the smallest values, positions of the largest
+                values); ties at a cutoff go to the earliest positions
+    """
+    size = values.size
+    low_kth = k_low - 1 if 0 < k_low < size else None
+    high_kth = size - k_high if 0 < k_high < size else None
+    
+    # A single partition places both cutoffs
+    kth = [i for i in (low_kth, high_kth) if i is not None]
+    partitioned = np.partition(values, kth) if kth else values
+    return (_select_side(values, k_low, partitioned, low_kth, np.less),
+            _select_side(values, k_high, partitioned, high_kth, np.greater))
+
+
+def _select_side(values, k, partitioned, kth, beyond):
+    """
+    Select the k values on one side of a cutoff found by _select_extremes.
+    
+    Args:
+        values (np.ndarray): Values to select from
+        k (int): Number of values to select
+        partitioned (np.ndarray): Values partitioned around kth
+        kth (int): Position of the cutoff in partitioned, or None to select all
+        beyond (np.ufunc): np.less or np.greater, the side to select
+        
+    Returns:
+        np.ndarray: Positions of the selected values
+    """
+    if k <= 0:
+        return np.arange(0)
+    if kth is None:
+        return np.arange(values.size)
+    cutoff = partitioned[kth]
+    inside = np.flatnonzero(beyond(values, cutoff))
+    ties = np.flatnonzero(values == cutoff)[:k - inside.size]
+    return np.concatenate((inside, ties))
+
+
 class TrendAnalyzer:
     """
     Analyzes stock trends using heap data structures and sliding windows.
@@ -47,8 +159,36 @@ class TrendAnalyzer:
         # Time of last update
         self.last_update = None
         
-        # Track current metrics
-        self.current_metrics = {}
+        # Track current metrics as one array per field, with a row per symbol;
+        # the arrays have spare capacity and only the first len(_metric_symbols)
+        # rows are in use
+        self._symbol_idx = {}
+        self._metric_symbols = []
+        self._prices = np.empty(0)
+        self._prev = np.empty(0)  # NaN where there was no previous price
+        self._pct = np.empty(0)
+        self._ts = np.empty(0, dtype=np.int64)
+        
+        # Latest (pct_change, timestamp) per symbol against each past snapshot
+        self._timeframe_pct = {timeframe: {} for timeframe in self.timeframe_heaps}
+        
+        # Heap groups with changes since their last rebuild: None for the main
+        # heaps, otherwise a timeframe. A group is rebuilt from the latest
+        # changes only when it is next read.
+        self._stale_heaps = set()
+        
+        # Top-k results keyed by (kind, n, timeframe); dropped whenever their heaps are rebuilt
+        self._topk_cache = {}
+        
+        # Updates come from the update thread while readers rebuild the heaps on
+        # callback threads; this guards the metrics, stale marks, heaps and cache
+        self._lock = threading.Lock()
+        
+        # Work buffers for the breakout scan, grown as the universe grows
+        self._scan_scratch = (np.empty(0), np.empty(0, dtype=bool), np.empty(0, dtype=bool))
+        
+        # Last (timestamp, formatted string) pair produced by _format_timestamp
+        self._fmt_cache = (None, '')
     
     def update(self, symbol, current_price, previous_price, timestamp=None):
         """
@@ -61,7 +201,7 @@ class TrendAnalyzer:
             timestamp (int): Timestamp of the data point
         """
         if timestamp is None:
-            timestamp = int(time.time())
+            timestamp = time.time_ns() // 1_000_000_000
         
         # Calculate percentage change
         if previous_price and previous_price > 0:
@@ -69,54 +209,177 @@ class TrendAnalyzer:
         else:
             pct_change = 0
         
-        # Update main heaps
-        self.gainers_heap.push(symbol, pct_change, timestamp)
-        self.losers_heap.push(symbol, pct_change, timestamp)
+        with self._lock:
+            recorded = self._apply_update(symbol, current_price, previous_price, pct_change, timestamp)
+            
+            # Update time-based comparisons if stock API is available
+            if recorded and self.stock_api:
+                self._update_timeframe_comparisons([symbol], np.array([current_price], dtype=np.float64),
+                                                   [timestamp])
+    
+    def _apply_update(self, symbol, current_price, previous_price, pct_change, timestamp):
+        """
+        Record one stock's new price once its percentage change is known.
+        
+        The caller must hold self._lock.
+        
+        Args:
+            symbol (str): Stock symbol
+            current_price (float): Current stock price
+            previous_price (float): Previous stock price for comparison
+            pct_change (float): Percentage change from the previous price
+            timestamp (int): Timestamp of the data point
+            
+        Returns:
+            bool: False if the update repeated the last prices and was skipped
+        """
+        row = self._symbol_idx.get(symbol)
+        if row is not None and self._prices[row] == current_price:
+            last_previous = self._prev[row]
+            if last_previous == previous_price or (previous_price is None and np.isnan(last_previous)):
+                # Same prices as the last update, so there is nothing new to record
+                self.last_update = timestamp
+                return False
+        
+        self._stale_heaps.add(None)
         
         # Update sliding window
         self.sliding_window.update(symbol, current_price, timestamp)
         
         # Update metrics
-        self.current_metrics[symbol] = {
-            'symbol': symbol,
-            'current_price': current_price,
-            'previous_price': previous_price,
-            'pct_change': pct_change,
-            'timestamp': timestamp
-        }
-        
-        # Update time-based comparisons if stock API is available
-        if self.stock_api:
-            self._update_timeframe_comparisons(symbol, current_price, timestamp)
+        if row is None:
+            row = self._add_metric_row(symbol)
+        self._prices[row] = current_price
+        self._prev[row] = np.nan if previous_price is None else previous_price
+        self._pct[row] = pct_change
+        self._ts[row] = timestamp
         
         self.last_update = timestamp
+        return True
     
-    def _update_timeframe_comparisons(self, symbol, current_price, timestamp):
+    def _add_metric_row(self, symbol):
         """
-        Update the timeframe-based comparisons for a symbol using data from the stock API.
+        Add a row for a new symbol to the metric arrays.
         
         Args:
             symbol (str): Stock symbol
-            current_price (float): Current stock price
-            timestamp (int): Timestamp of the data point
+            
+        Returns:
+            int: Row index of the symbol
+        """
+        row = self._symbol_idx[symbol] = len(self._metric_symbols)
+        self._metric_symbols.append(symbol)
+        
+        if row == self._prices.size:
+            # Double the capacity so adding symbols costs amortized O(1)
+            extra = max(row, 8)
+            self._prices = np.concatenate((self._prices, np.full(extra, np.nan)))
+            self._prev = np.concatenate((self._prev, np.full(extra, np.nan)))
+            self._pct = np.concatenate((self._pct, np.zeros(extra)))
+            self._ts = np.concatenate((self._ts, np.zeros(extra, dtype=np.int64)))
+        return row
+    
+    @property
+    def current_metrics(self):
+        """Latest metrics per symbol as a dictionary of dictionaries."""
+        return self.to_dict_of_dicts()
+    
+    def to_dict_of_dicts(self):
+        """
+        Build the per-symbol metric dictionaries from the metric arrays.
+        
+        Returns:
+            dict: Dictionary mapping symbols to {symbol, current_price,
+                  previous_price, pct_change, timestamp} dicts
+        """
+        count = len(self._metric_symbols)
+        previous = self._prev[:count]
+        previous_prices = np.where(np.isnan(previous), None, previous).tolist()
+        return {
+            symbol: {
+                'symbol': symbol,
+                'current_price': current_price,
+                'previous_price': previous_price,
+                'pct_change': pct_change,
+                'timestamp': timestamp
+            }
+            for symbol, current_price, previous_price, pct_change, timestamp in zip(
+                self._metric_symbols, self._prices[:count].tolist(), previous_prices,
+                self._pct[:count].tolist(), self._ts[:count].tolist())
+        }
+    
+    def _timeframe_references(self, symbols):
+        """
+        Look up each symbol's price in the timeframe snapshots of the stock API.
+        
+        Each snapshot is fetched once per call, however many symbols it covers.
+        
+        Args:
+            symbols (list): Stock symbols
+            
+        Returns:
+            tuple: (timeframes that have a snapshot, one list of historical
+                    prices per timeframe with None where a symbol is missing)
         """
-        # Get timeframe data from the stock API
+        timeframes = []
+        columns = []
         for timeframe in ['one_week', 'two_week']:
             timeframe_data = self.stock_api.get_timeframe_data(timeframe)
-            
-            if timeframe_data and symbol in timeframe_data:
-                # Get historical price for this timeframe
-                historical_data = timeframe_data[symbol]
-                historical_price = historical_data.get('price')
-                
-                if historical_price and historical_price > 0:
-                    # Calculate percentage change
-                    pct_change = ((current_price - historical_price) / historical_price) * 100
-                    
-                    # Update heaps for this timeframe
-                    self.timeframe_heaps[timeframe]['gainers'].push(symbol, pct_change, timestamp)
-                    self.timeframe_heaps[timeframe]['losers'].push(symbol, pct_change, timestamp)
-                    self.timeframe_heaps[timeframe]['last_update'] = timestamp
+            if timeframe_data:
+                timeframes.append(timeframe)
+                # One dict probe per symbol; missing symbols come back as None
+                entries = map(timeframe_data.get, symbols)
+                columns.append([None if entry is None else entry.get('price') for entry in entries])
+        return timeframes, columns
+    
+    def _record_timeframe_changes(self, timeframes, symbols, pct_changes, valid, rows, timestamps):
+        """
+        Record percentage changes against the timeframe snapshots for the heaps.
+        
+        The caller must hold self._lock.
+        
+        Args:
+            timeframes (list): Timeframe of each column of pct_changes
+            symbols (list): Stock symbols
+            pct_changes (np.ndarray): (symbols, timeframes) percentage changes
+            valid (np.ndarray): Mask of the changes that have a positive historical price
+            rows (list): Positions of the symbols to record, in order
+            timestamps (list): Timestamp of each symbol's data point
+        """
+        for column, timeframe in enumerate(timeframes):
+            changes = self._timeframe_pct[timeframe]
+            pct_list = pct_changes[:, column].tolist()
+            valid_list = valid[:, column].tolist()
+            last_row = None
+            stale = False
+            for i in rows:
+                if valid_list[i]:
+                    entry = (pct_list[i], timestamps[i])
+                    if changes.get(symbols[i]) != entry:
+                        changes[symbols[i]] = entry
+                        stale = True
+                    last_row = i
+            if last_row is not None:
+                self.timeframe_heaps[timeframe]['last_update'] = timestamps[last_row]
+            if stale:
+                self._stale_heaps.add(timeframe)
+    
+    def _update_timeframe_comparisons(self, symbols, current_prices, timestamps):
+        """
+        Update the timeframe-based comparisons using data from the stock API.
+        
+        Args:
+            symbols (list): Stock symbols
+            current_prices (np.ndarray): Current price of each symbol
+            timestamps (list): Timestamp of each symbol's data point
+        """
+        timeframes, columns = self._timeframe_references(symbols)
+        if not timeframes:
+            return
+        
+        pct_changes, valid = _pct_changes(current_prices, np.array(columns, dtype=np.float64).T)
+        self._record_timeframe_changes(timeframes, symbols, pct_changes, valid,
+                                       range(len(symbols)), timestamps)
     
     def update_batch(self, price_data, previous_data=None):
         """
@@ -127,20 +390,105 @@ class TrendAnalyzer:
                               {symbol: {'price': float, 'timestamp': int}}
             previous_data (dict): Previous price data for comparison
         """
+        symbols = []
+        current_prices = []
+        previous_prices = []
+        timestamps = []
         for symbol, data in price_data.items():
             current_price = data.get('price')
-            timestamp = data.get('timestamp')
-            
             if current_price is None:
                 continue
-                
+            
             # Get previous price
             previous_price = None
             if previous_data and symbol in previous_data:
                 previous_price = previous_data[symbol].get('price')
             
-            # Update with new data
-            self.update(symbol, current_price, previous_price, timestamp)
+            symbols.append(symbol)
+            current_prices.append(current_price)
+            previous_prices.append(previous_price)
+            timestamps.append(data.get('timestamp'))
+        
+        if not symbols:
+            return
+        
+        # Line up every reference price, the previous one and one per timeframe
+        # snapshot, as the columns of one matrix
+        columns = [previous_prices]
+        timeframes = []
+        if self.stock_api:
+            timeframes, timeframe_columns = self._timeframe_references(symbols)
+            columns.extend(timeframe_columns)
+        
+        # Percentage changes against all of them in one expression
+        current = np.array(current_prices, dtype=np.float64)
+        pct_changes, valid = _pct_changes(current, np.array(columns, dtype=np.float64).T)
+        
+        now = time.time_ns() // 1_000_000_000
+        recorded = []
+        with self._lock:
+            for i, (symbol, current_price, previous_price, pct_change, timestamp) in enumerate(zip(
+                    symbols, current_prices, previous_prices, pct_changes[:, 0].tolist(), timestamps)):
+                if timestamp is None:
+                    timestamp = timestamps[i] = now
+                
+                # Update with new data
+                if self._apply_update(symbol, current_price, previous_price, pct_change, timestamp):
+                    recorded.append(i)
+            
+            # Update time-based comparisons for the recorded symbols
+            if recorded and timeframes:
+                self._record_timeframe_changes(timeframes, symbols, pct_changes[:, 1:], valid[:, 1:],
+                                               recorded, timestamps)
+    
+    def _rebuild_heaps(self, timeframe):
+        """
+        Refill one group of gainers and losers heaps from the latest percentage changes.
+        
+        The caller must hold self._lock.
+        
+        Args:
+            timeframe (str): Timeframe of the heaps, or None for the main heaps
+        """
+        # Clear the stale mark before reading the changes, so any change made
+        # after this point marks the group again
+        self._stale_heaps.discard(timeframe)
+        # Filter a snapshot of the entries, since another reader may be adding one
+        self._topk_cache = {key: top for key, top in list(self._topk_cache.items())
+                            if key[2] != timeframe}
+        
+        if timeframe is None:
+            count = len(self._metric_symbols)
+            self._refill_heaps(self.gainers_heap, self.losers_heap, self._metric_symbols,
+                               self._pct[:count], self._ts[:count].tolist())
+        else:
+            changes = self._timeframe_pct[timeframe]
+            heaps = self.timeframe_heaps[timeframe]
+            # One snapshot of the entries keeps symbols and values aligned
+            items = list(changes.items())
+            values = np.fromiter((pct_change for _, (pct_change, _) in items),
+                                 dtype=np.float64, count=len(items))
+            self._refill_heaps(heaps['gainers'], heaps['losers'], [symbol for symbol, _ in items],
+                               values, [timestamp for _, (_, timestamp) in items])
+    
+    def _refill_heaps(self, gainers, losers, symbols, values, timestamps):
+        """
+        Replace the contents of a gainers and losers heap pair.
+        
+        Both heaps' entries are picked with one partial sort over all values
+        instead of being pushed one symbol at a time.
+        
+        Args:
+            gainers (StockMaxHeap): Heap of the largest values
+            losers (StockMinHeap): Heap of the smallest values
+            symbols (list): Stock symbols
+            values (np.ndarray): Percentage change of each symbol
+            timestamps (list): Timestamp of each symbol's change
+        """
+        lowest, highest = _select_extremes(values, losers.max_size, gainers.max_size)
+        for heap, positions in ((gainers, highest), (losers, lowest)):
+            heap.replace_all([symbols[i] for i in positions.tolist()], values[positions].tolist(),
+                             [timestamps[i] for i in positions.tolist()])
     
     def get_top_gainers(self, n=None, timeframe=None):
         """
@@ -153,9 +501,7 @@ class TrendAnalyzer:
         Returns:
             list: List of top gainers
         """
-        if timeframe and timeframe in self.timeframe_heaps:
-            return self.timeframe_heaps[timeframe]['gainers'].get_top(n)
-        return self.gainers_heap.get_top(n)
+        return self._get_top('gainers', n, timeframe)
     
     def get_top_losers(self, n=None, timeframe=None):
         """
@@ -168,9 +514,36 @@ class TrendAnalyzer:
         Returns:
             list: List of top losers
         """
-        if timeframe and timeframe in self.timeframe_heaps:
-            return self.timeframe_heaps[timeframe]['losers'].get_top(n)
-        return self.losers_heap.get_top(n)
+        return self._get_top('losers', n, timeframe)
+    
+    def _get_top(self, kind, n, timeframe):
+        """
+        Get the top n entries of a gainers or losers heap, memoized until its heaps change.
+        
+        Args:
+            kind (str): 'gainers' or 'losers'
+            n (int): Number of entries to return
+            timeframe (str): Timeframe for comparison, or None for default
+            
+        Returns:
+            list: List of (value, symbol, timestamp) tuples
+        """
+        if not (timeframe and timeframe in self.timeframe_heaps):
+            timeframe = None
+        key = (kind, n, timeframe)
+        
+        with self._lock:
+            if timeframe in self._stale_heaps:
+                self._rebuild_heaps(timeframe)
+            
+            top = self._topk_cache.get(key)
+            if top is None:
+                if timeframe is None:
+                    heap = self.gainers_heap if kind == 'gainers' else self.losers_heap
+                else:
+                    heap = self.timeframe_heaps[timeframe][kind]
+                top = self._topk_cache[key] = heap.get_top(n)
+        return top
     
     def get_momentum_stocks(self, n=5):
         """
@@ -196,36 +569,71 @@ class TrendAnalyzer:
         """
         return self.sliding_window.get_top_performers(n, metric='volatility')
     
-    def detect_breakouts(self, threshold_pct=5):
+    def detect_breakouts(self, threshold_pct=5, n=None):
         """
         Detect stocks breaking out (crossing a significant threshold).
         
         Args:
             threshold_pct (float): Percentage threshold for considering a breakout
+            n (int): Maximum number of breakouts to return, or None for all
             
         Returns:
-            list: List of stocks in breakout
+            list: List of stocks in breakout, largest breakout first
         """
-        metrics = self.sliding_window.calculate_all_metrics()
-        breakouts = []
+        arrays = self.sliding_window.metrics_arrays()
+        current = arrays['current_price']
+        positions, upward, breakout_pcts = _scan_breakouts(current, arrays['avg_price'], threshold_pct,
+                                                           self._get_scan_scratch(current.size))
         
-        for symbol, data in metrics.items():
-            if not data or data.get('insufficient_data', False):
-                continue
-                
-            # Check if current price is significantly higher than the average
-            if data['current_price'] > data['avg_price'] * (1 + threshold_pct/100):
-                data['breakout_type'] = 'upward'
-                data['breakout_pct'] = ((data['current_price'] - data['avg_price']) / data['avg_price']) * 100
-                breakouts.append(data)
+        # When only the largest n are wanted, a partial sort finds the n-th
+        # largest value and only the candidates at or above it are ordered
+        candidates = np.arange(breakout_pcts.size)
+        if n is not None and 0 < n < breakout_pcts.size:
+            cutoff = np.partition(breakout_pcts, breakout_pcts.size - n)[breakout_pcts.size - n]
+            candidates = np.flatnonzero(breakout_pcts >= cutoff)
+        
+        # Stable ordering keeps ties in symbol order, as sorted() would
+        order = candidates[np.argsort(-breakout_pcts[candidates], kind='stable')[:n]]
+        positions = positions[order]
+        breakouts = self.sliding_window.metrics_records(arrays, positions)
+        for data, is_upward, breakout_pct in zip(breakouts, upward[order].tolist(),
+                                                 breakout_pcts[order].tolist()):
+            data['breakout_type'] = 'upward' if is_upward else 'downward'
+            data['breakout_pct'] = breakout_pct
+        
+        return breakouts
+    
+    def _get_scan_scratch(self, size):
+        """
+        Get the breakout scan's work buffers, doubling them if they are too small.
+        
+        Args:
+            size (int): Number of elements needed
             
-            # Check for downward breakout
-            elif data['current_price'] < data['avg_price'] * (1 - threshold_pct/100):
-                data['breakout_type'] = 'downward'
-                data['breakout_pct'] = ((data['avg_price'] - data['current_price']) / data['avg_price']) * 100
-                breakouts.append(data)
+        Returns:
+            tuple: (float, bool, bool) buffers with at least size elements
+        """
+        capacity = self._scan_scratch[0].size
+        if capacity < size:
+            capacity = max(size, 2 * capacity)
+            self._scan_scratch = (np.empty(capacity), np.empty(capacity, dtype=bool),
+                                  np.empty(capacity, dtype=bool))
+        return self._scan_scratch
+    
+    def _format_timestamp(self, timestamp):
+        """
+        Format a timestamp as local time, reusing the last result for the same second.
         
-        return sorted(breakouts, key=lambda x: abs(x.get('breakout_pct', 0)), reverse=True)
+        Args:
+            timestamp (int): Unix timestamp in seconds
+            
+        Returns:
+            str: Timestamp formatted as 'YYYY-MM-DD HH:MM:SS'
+        """
+        timestamp = int(timestamp)
+        if timestamp != self._fmt_cache[0]:
+            self._fmt_cache = (timestamp, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp)))
+        return self._fmt_cache[1]
     
     def generate_summary_report(self, timeframe=None):
         """
@@ -241,7 +649,7 @@ class TrendAnalyzer:
         top_losers = self.get_top_losers(5, timeframe)
         momentum_stocks = self.get_momentum_stocks(5)
         volatile_stocks = self.get_highest_volatility(5)
-        breakouts = self.detect_breakouts()
+        breakouts = self.detect_breakouts(n=5)
         
         # Determine the appropriate title based on timeframe
         timeframe_title = ""
@@ -250,14 +658,15 @@ class TrendAnalyzer:
         elif timeframe == 'two_week':
             timeframe_title = "2 Week Comparison"
         
+        timestamp = self.last_update or time.time_ns() // 1_000_000_000
         return {
-            'timestamp': self.last_update or int(time.time()),
-            'datetime': datetime.fromtimestamp(self.last_update or time.time()).strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': timestamp,
+            'datetime': self._format_timestamp(timestamp),
             'timeframe': timeframe,
             'timeframe_title': timeframe_title,
             'top_gainers': top_gainers,
             'top_losers': top_losers,
             'momentum_stocks': momentum_stocks,
             'volatile_stocks': volatile_stocks,
-            'breakouts': breakouts[:5] if len(breakouts) > 5 else breakouts
+            'breakouts': breakouts
         }